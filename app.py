@@ -1,39 +1,59 @@
 # Standard library imports
-import io
+import atexit
 import json
 import re
 import os
-from datetime import datetime
+import time
+from datetime import timedelta
 
 # Third-party imports
 import numpy as np
 import pandas as pd
-from flask import Flask, render_template, request, redirect, url_for, jsonify, send_file, session, Response
-import joblib
-import plotly
+from flask import Flask, render_template, request, redirect, url_for, jsonify, send_file, session, Response, g
 import plotly.express as px
 import mysql.connector
 from wordcloud import WordCloud
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import landscape, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import cm
 
 # Local imports
-from config.database import get_connection
+from config.database import get_connection, release_connection, get_pool_stats
 from models.LDATransformer import LDATransformer
-from models.TextPreprocessor import TextPreprocessor
+from models.TextPreprocessor import TextPreprocessor, DEFAULT_STEM_CACHE_SIZE, DEFAULT_CHUNK_SIZE
+from services.model_loader import load_models, memory_usage
+from services.dashboard_data import (
+    fetch_sentiment_counts, fetch_monthly_counts, fetch_available_years, fetch_report_counts, fetch_aspect_name
+)
+from services.aggregation import summarize_counts, summarize_batches
+from services.cache import TTLCache, data_version
+from services.wordcloud_data import fetch_token_frequencies
+from services.term_frequency import count_terms, upsert_term_frequencies
+from services.ingest import iter_upload_chunks, estimate_total_rows
+from services.result_store import ResultStore, RESULT_STORE_DIR
+from services.jobs import Job, JobManager
+from services.dedup import insert_new_rows, normalize_keluhan
+from services.batcher import MicroBatcher
+from services.metrics import registry, timed, observe_stage, RequestProfiler, REQUEST_SECONDS
+from services.export import write_xlsx, iter_csv, iter_parquet, parquet_available, EXPORT_BATCH_SIZE
+from services.report import build_summary_pdf, report_range
+from services.chart_payload import compact_charts
+from services.http_cache import CompressedBody, conditional_response, last_modified_from
 
 app = Flask(__name__, static_folder='static', static_url_path='/static')
 app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
 
+# Jumlah baris yang diproses sekaligus oleh pipeline saat analisis file
+BATCH_CHUNK_SIZE = int(os.getenv('BATCH_CHUNK_SIZE', '1000'))
+
 # Function to ensure connection is active
+# Koneksi diambil dari pool sekali per request dan dikembalikan saat teardown
 def ensure_connection():
     try:
+        connection = g.get('db_connection')
+        if connection is not None:
+            return connection
         connection = get_connection()
         if connection is None:
             raise Exception("Failed to establish database connection")
+        g.db_connection = connection
         return connection
     except mysql.connector.Error as e:
         print(f"Database connection error: {e}")
@@ -43,16 +63,82 @@ def ensure_connection():
         raise
 
 
+@app.teardown_appcontext
+def release_db_connection(exception):
+    connection = g.pop('db_connection', None)
+    if connection is not None:
+        release_connection(connection)
+
+
+# Profiling cProfile untuk sebagian request (PROFILE_SAMPLE_RATE 0..1, 0 = nonaktif)
+request_profiler = RequestProfiler(
+    sample_rate=float(os.getenv('PROFILE_SAMPLE_RATE', '0')),
+    output_dir=os.getenv('PROFILE_DIR', 'profiles')
+)
+
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    g.profiler = request_profiler.start()
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - start,
+                                endpoint=request.endpoint or 'unknown',
+                                method=request.method,
+                                status=response.status_code)
+    return response
+
+@app.teardown_request
+def finish_request_profile(exception):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        try:
+            path = request_profiler.finish(profiler, request.endpoint or 'unknown')
+            print(f"Request profile saved to {path}.txt")
+        except OSError as e:
+            print(f"Warning: Could not save request profile: {e}")
+
+
 # Load the pipeline models with error handling
+# Array model di-memory-map (MODEL_MMAP_MODE=r) agar dipakai bersama oleh worker gunicorn
+MODEL_MMAP_MODE = os.getenv('MODEL_MMAP_MODE', 'r') or None
 try:
-    topic_model = joblib.load('models/pipeline_topic.pkl')
-    sentiment_model = joblib.load('models/pipeline_sentiment.pkl')
+    topic_model, sentiment_model, inference_service, model_stats = load_models(
+        mmap_mode=MODEL_MMAP_MODE,
+        warmup=os.getenv('MODEL_WARMUP', 'True').lower() == 'true',
+        # Cache hasil prediksi: LRU di memori + SQLite opsional yang bertahan setelah restart
+        cache_size=int(os.getenv('PREDICTION_CACHE_SIZE', '10000')),
+        cache_path=os.getenv('PREDICTION_CACHE_PATH') or None,
+        cache_disk_max_rows=int(os.getenv('PREDICTION_CACHE_DISK_MAX_ROWS', '100000'))
+    )
     print("Models loaded successfully")
 except Exception as e:
     print(f"Warning: Could not load models: {e}")
     print("Application will continue but ML features may not work")
     topic_model = None
     sentiment_model = None
+    inference_service = None
+    model_stats = {}
+
+# Konfigurasi preprocessor: cache stemming (bisa di-pre-warm dari file) dan paralelisme
+STEM_CACHE_PATH = os.getenv('STEM_CACHE_PATH')
+if topic_model is not None:
+    stem_preprocessor = topic_model.named_steps['preprocessor']
+    stem_preprocessor.stem_cache_size = int(os.getenv('STEM_CACHE_SIZE', DEFAULT_STEM_CACHE_SIZE))
+    # Preprocessing paralel multi-core untuk upload besar
+    stem_preprocessor.n_jobs = int(os.getenv('PREPROCESS_N_JOBS', '1'))
+    stem_preprocessor.chunk_size = int(os.getenv('PREPROCESS_CHUNK_SIZE', DEFAULT_CHUNK_SIZE))
+    if STEM_CACHE_PATH:
+        if os.path.exists(STEM_CACHE_PATH):
+            try:
+                loaded = stem_preprocessor.load_stem_cache(STEM_CACHE_PATH)
+                print(f"Stem cache pre-warmed with {loaded} words")
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load stem cache: {e}")
+        atexit.register(stem_preprocessor.save_stem_cache, STEM_CACHE_PATH)
 
 # Definisikan judul untuk setiap topik
 judul_topik = {
@@ -101,50 +187,30 @@ instansi_mapping = {
 def home():
     return render_template('index.html', active_page='home', content='home/home.html')
 
-@app.route('/dashboard', methods=['GET', 'POST'])
-def dashboard():
-    try:
-        connection = ensure_connection()
-        cursor = connection.cursor(dictionary=True)
-
-        # Query untuk mendapatkan daftar tahun unik
-        cursor.execute("SELECT DISTINCT YEAR(tanggal_keluhan) AS year FROM sentiment_analysis ORDER BY year")
-        years = cursor.fetchall()
-
-        # Default nilai tahun
-        year_value = request.form.get('year') or 2023
-
-        query = """
-            SELECT
-                sa.sentimen,
-                sa.tanggal_keluhan,
-                a.aspect
-            FROM
-                sentiment_analysis sa
-            JOIN
-                aspect a
-            ON
-                sa.aspect_id = a.aspect_id
-            WHERE
-                YEAR(sa.tanggal_keluhan) = %s;
-        """
-        df = pd.read_sql(query, connection, params=(year_value,))
-        cursor.close()
-    except Exception as e:
-        print(f"Dashboard error: {e}")
-        return render_template('error.html', error="Database connection failed"), 500
+# Cache hasil render dashboard per tahun, otomatis kedaluwarsa saat data berubah
+dashboard_cache = TTLCache(maxsize=int(os.getenv('DASHBOARD_CACHE_SIZE', '32')),
+                           ttl=float(os.getenv('DASHBOARD_CACHE_TTL', '600')))
+
+def build_dashboard_context(connection, year):
+    """Hitung KPI dan JSON seluruh chart dashboard untuk satu tahun."""
+    # Ambil hanya data agregat: aspek x sentimen dan bulan x aspek
+    sentiment_counts = fetch_sentiment_counts(connection, year)
+    monthly_counts = fetch_monthly_counts(connection, year)
+
+    # Satu pass agregasi (matriks aspek x sentimen dan bulan x aspek)
+    # menjadi sumber KPI dan seluruh chart
+    with timed('chart_build'):
+        summary = summarize_counts(sentiment_counts, monthly_counts)
+        bubble_chart = create_bubble_chart(summary)
+        stacked_chart = create_stacked_bar_chart(summary)
+        line_chart = create_line_chart(summary)
+        summary_table = create_summary_table(summary)
+        pie_chart, persentase_negatif, persentase_netral = create_pie_chart(summary)
 
     # Hitung KPI Index
-    total_keluhan = len(df)
-    keluhan_netral = len(df[df['sentimen'] == 'netral'])
-    keluhan_negatif = len(df[df['sentimen'] == 'negatif'])
-
-    # Chart Data
-    bubble_chart = create_bubble_chart(df)
-    stacked_chart = create_stacked_bar_chart(df)
-    line_chart = create_line_chart(df)
-    summary_table = create_summary_table(df)
-    pie_chart, persentase_negatif, persentase_netral = create_pie_chart(df)
+    total_keluhan = summary.total
+    keluhan_netral = summary.count('netral')
+    keluhan_negatif = summary.count('negatif')
 
     # Buat explanationText berdasarkan persentase
     explanationText = ""
@@ -155,82 +221,156 @@ def dashboard():
     else:
         explanationText = "Netral"
         percentage = f"{persentase_netral:.2f}%"
-        
-    return render_template(
+
+    # Semua figure dalam satu payload JSON ringkas, dikompres sekali per versi data
+    with timed('chart_serialize'):
+        charts = CompressedBody(
+            compact_charts({
+                'pie-chart': pie_chart,
+                'bubble-chart': bubble_chart,
+                'stacked-chart': stacked_chart,
+                'line-chart': line_chart
+            }),
+            'application/json',
+            last_modified=last_modified_from(data_version.updated_at)
+        )
+
+    return {
+        'charts': charts,
+        'summary_table': summary_table,
+        'explanationText': explanationText,
+        'percentage': percentage,
+        'total_keluhan': total_keluhan,
+        'keluhan_netral': keluhan_netral,
+        'keluhan_negatif': keluhan_negatif
+    }
+
+def get_dashboard_context(connection, year):
+    key = ('dashboard', year, data_version.refresh(connection))
+    context = dashboard_cache.get(key)
+    if context is None:
+        context = build_dashboard_context(connection, year)
+        dashboard_cache.set(key, context)
+    return context
+
+def get_available_years(connection):
+    key = ('years', data_version.refresh(connection))
+    years = dashboard_cache.get(key)
+    if years is None:
+        years = fetch_available_years(connection)
+        dashboard_cache.set(key, years)
+    return years
+
+def prewarm_dashboard_cache():
+    # Render dashboard untuk semua tahun yang tersedia saat aplikasi start
+    with app.app_context():
+        try:
+            connection = ensure_connection()
+            years = get_available_years(connection)
+            for row in years:
+                get_dashboard_context(connection, int(row['year']))
+            print(f"Dashboard cache pre-warmed for {len(years)} year(s)")
+        except Exception as e:
+            print(f"Warning: Could not pre-warm dashboard cache: {e}")
+
+@app.route('/dashboard', methods=['GET', 'POST'])
+def dashboard():
+    # Default nilai tahun (POST tetap diterima untuk form lama)
+    year_value = str(request.values.get('year') or 2023)
+    if not year_value.isdigit() or len(year_value) != 4:
+        return render_template('error.html', error="Invalid year format"), 400
+    year_value = int(year_value)
+
+    try:
+        connection = ensure_connection()
+
+        # Daftar tahun unik dan data dashboard, dari cache bila tersedia
+        years = get_available_years(connection)
+        context = get_dashboard_context(connection, year_value)
+    except Exception as e:
+        print(f"Dashboard error: {e}")
+        return render_template('error.html', error="Database connection failed"), 500
+
+    html = render_template(
         'index.html',
         active_page='dashboard',
         content='dashboard/dashboard.html',
-        bubble_chart=json.dumps(bubble_chart, cls=plotly.utils.PlotlyJSONEncoder),
-        stacked_chart=json.dumps(stacked_chart, cls=plotly.utils.PlotlyJSONEncoder),
-        line_chart=json.dumps(line_chart, cls=plotly.utils.PlotlyJSONEncoder),
-        summary_table=summary_table,
-        pie_chart=json.dumps(pie_chart, cls=plotly.utils.PlotlyJSONEncoder),
-        explanationText=explanationText,
-        percentage=percentage,
         years=years,  # Daftar tahun
-        selected_year=int(year_value),  # Tahun terpilih
-        total_keluhan=total_keluhan,
-        keluhan_netral=keluhan_netral,
-        keluhan_negatif=keluhan_negatif
+        selected_year=year_value,  # Tahun terpilih
+        **context
     )
+    if request.method != 'GET':
+        return html
+    return conditional_response(request, CompressedBody(html.encode('utf-8'), 'text/html'))
+
+@app.route('/dashboard/charts')
+def dashboard_charts():
+    """Figure dashboard sebagai JSON ringkas; 304 bila data belum berubah."""
+    year_value = str(request.args.get('year') or 2023)
+    if not year_value.isdigit() or len(year_value) != 4:
+        return jsonify({'error': 'Invalid year format'}), 400
+
+    try:
+        context = get_dashboard_context(ensure_connection(), int(year_value))
+    except Exception as e:
+        print(f"Dashboard charts error: {e}")
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    return conditional_response(request, context['charts'])
 
     
-def create_summary_table(df):
-    sentiment_map = {'negatif': -1, 'netral': 0}
-    summary = df[df['sentimen'].isin(sentiment_map.keys())].groupby('aspect').agg(
-        total=('sentimen', 'size'),
-        negatif=('sentimen', lambda x: (x == 'negatif').sum()),
-        netral=('sentimen', lambda x: (x == 'netral').sum())
-    ).reset_index()
-    
-    # Zero division protection
-    summary['persentase_negatif'] = np.where(summary['total'] > 0, 
-                                           (summary['negatif'] / summary['total'] * 100).round(2), 0)
-    summary['persentase_netral'] = np.where(summary['total'] > 0, 
-                                          (summary['netral'] / summary['total'] * 100).round(2), 0)
+def create_summary_table(summary):
+    if not summary.total:
+        return ''
+
+    negatif = summary.matrix[:, summary.sentiments.index('negatif')].tolist()
+    netral = summary.matrix[:, summary.sentiments.index('netral')].tolist()
+    percentages = summary.percentages()
+    persentase_negatif = percentages[:, summary.sentiments.index('negatif')].tolist()
+    persentase_netral = percentages[:, summary.sentiments.index('netral')].tolist()
 
     table_html = ''.join(
         f"""
         <tr>
-            <td>{row['aspect']}</td>
-            <td>{row['total']}</td>
-            <td>{row['negatif']}</td>
-            <td>{row['netral']}</td>
-            <td>{row['persentase_negatif']}%</td>
-            <td>{row['persentase_netral']}%</td>
+            <td>{aspect}</td>
+            <td>{total}</td>
+            <td>{neg}</td>
+            <td>{net}</td>
+            <td>{pct_neg}%</td>
+            <td>{pct_net}%</td>
         </tr>
         """
-        for _, row in summary.iterrows()
+        for aspect, total, neg, net, pct_neg, pct_net in zip(
+            summary.aspects, summary.aspect_totals.tolist(), negatif, netral,
+            persentase_negatif, persentase_netral)
     )
     return table_html
 
 
-def create_pie_chart(df):
-    sentiment_counts = df[df['sentimen'].isin(['negatif', 'netral'])]['sentimen'].value_counts()
-    
-    # Pastikan hanya menampilkan data jika ada
-    if sentiment_counts.empty:
-        sentiment_counts = pd.Series([0, 0], index=['negatif', 'netral'])  # Menangani kasus tidak ada data
-
-    # Hitung persentase
-    total = sentiment_counts.sum()
-    persentase_negatif = (sentiment_counts.get('negatif', 0) / total * 100) if total > 0 else 0
-    persentase_netral = (sentiment_counts.get('netral', 0) / total * 100) if total > 0 else 0
+def create_pie_chart(summary):
+    # Urut dari jumlah terbesar; tetap tampil (nol) bila tidak ada data
+    totals = summary.sentiment_totals
+    order = np.argsort(-totals, kind='stable')
+    percentages = summary.sentiment_percentages()
+    persentase_negatif = float(percentages[summary.sentiments.index('negatif')])
+    persentase_netral = float(percentages[summary.sentiments.index('netral')])
 
     fig = px.pie(
-        names=sentiment_counts.index,
-        values=sentiment_counts.values,
+        names=[summary.sentiments[i] for i in order],
+        values=totals[order],
         title="Proporsi Sentimen Negatif dan Netral",
         color_discrete_sequence=px.colors.qualitative.Set3
     )
     
     return fig, persentase_negatif, persentase_netral
 
-def create_bubble_chart(df):
-    bubble_data = df.groupby('aspect').agg(
-        sentiment_score=('sentimen', lambda x: np.mean([{'negatif': -1, 'netral': 0}.get(i, 0) for i in x])),
-        count=('aspect', 'size')
-    ).reset_index()
+def create_bubble_chart(summary):
+    # Rata-rata skor sentimen tertimbang jumlah keluhan per aspek
+    bubble_data = pd.DataFrame({
+        'aspect': summary.aspects,
+        'sentiment_score': summary.mean_scores(),
+        'count': summary.aspect_totals
+    })
     
     fig = px.scatter(
         bubble_data, 
@@ -247,11 +387,13 @@ def create_bubble_chart(df):
     
     return fig
 
-def create_stacked_bar_chart(df):
-    sentiment_counts = df[df['sentimen'].isin(['netral', 'negatif'])].groupby(['aspect', 'sentimen']).size().unstack(fill_value=0)
-    sentiment_counts['total'] = sentiment_counts.sum(axis=1)
-    sentiment_counts = sentiment_counts.sort_values('total', ascending=False)
-    sentiment_counts = sentiment_counts.drop(columns='total')
+def create_stacked_bar_chart(summary):
+    order = np.argsort(-summary.aspect_totals, kind='stable')
+    sentiment_counts = pd.DataFrame(
+        summary.matrix[order],
+        index=pd.Index(summary.aspects[order], name='aspect'),
+        columns=pd.Index(summary.sentiments, name='sentimen')
+    )
 
     fig = px.bar(
         sentiment_counts, 
@@ -264,9 +406,14 @@ def create_stacked_bar_chart(df):
     
     return fig
 
-def create_line_chart(df):
-    df['month'] = pd.to_datetime(df['tanggal_keluhan']).dt.to_period('M').astype(str)
-    trend_data = df.groupby(['month', 'aspect']).size().unstack(fill_value=0)
+def create_line_chart(summary):
+    # Hanya aspek yang muncul pada data bulanan
+    used = summary.monthly.sum(axis=0) > 0
+    trend_data = pd.DataFrame(
+        summary.monthly[:, used],
+        index=pd.Index(summary.months, name='month'),
+        columns=pd.Index(summary.aspects[used], name='aspect')
+    )
     
     fig = px.line(
         trend_data, 
@@ -279,6 +426,10 @@ def create_line_chart(df):
     return fig
 
     
+# Cache path PNG word cloud per (tahun, aspek, versi data)
+wordcloud_cache = TTLCache(maxsize=int(os.getenv('WORDCLOUD_CACHE_SIZE', '64')),
+                           ttl=float(os.getenv('WORDCLOUD_CACHE_TTL', '3600')))
+
 @app.route('/wordcloud', methods=['GET', 'POST'])
 def wordcloud():
     try:
@@ -290,8 +441,7 @@ def wordcloud():
         aspects = [{'aspect_id': 'all', 'aspect': 'Semua Aspek'}] + cursor.fetchall()
 
         # Ambil daftar tahun
-        cursor.execute("SELECT DISTINCT YEAR(tanggal_keluhan) AS year FROM sentiment_analysis ORDER BY year")
-        years = cursor.fetchall()
+        years = get_available_years(connection)
 
         wordcloud_paths = {'netral': None, 'negatif': None, 'keseluruhan': None}
         message = None
@@ -311,49 +461,29 @@ def wordcloud():
             if not selected_year.isdigit() or len(selected_year) != 4:
                 return render_template('error.html', error="Invalid year format"), 400
 
-            sentiments = {
-                'netral': "netral",
-                'negatif': "negatif",
-                'keseluruhan': None  # Semua data
-            }
-
-            has_data = False
-            for sentiment, label in sentiments.items():
-                # Query untuk data
-                query = f"""
-                    SELECT preprocessed_text 
-                    FROM sentiment_analysis
-                    WHERE YEAR(tanggal_keluhan) = %s
-                      AND (aspect_id = %s OR %s = 'all')
-                      {f"AND sentimen = %s" if label else ""}
-                """
-                params = [selected_year, aspect_id, aspect_id]
-                if label:
-                    params.append(label)
-
-                cursor.execute(query, params)
-                results = cursor.fetchall()
-
-                # Proses data jika ada hasil
-                text_data = []
-                for row in results:
-                    if row['preprocessed_text']:
-                        try:
-                            preprocessed_text = json.loads(row['preprocessed_text'])
-                            text_data.extend(preprocessed_text)
-                        except json.JSONDecodeError:
-                            continue  # Skip if there's a JSON decode error
-
-                if text_data:
-                    has_data = True
-                    wc = WordCloud(width=800, height=400, background_color='white').generate(' '.join(text_data))
+            key = ('wordcloud', selected_year, aspect_id, data_version.refresh(connection))
+            cached_paths = wordcloud_cache.get(key)
+            if cached_paths is not None and all(os.path.exists(path) for path in cached_paths.values() if path):
+                wordcloud_paths = cached_paths
+            else:
+                # Satu query untuk semua sentimen, lalu render dari frekuensi token
+                frequencies = fetch_token_frequencies(connection, selected_year, aspect_id)
+                for sentiment in wordcloud_paths:
+                    token_counts = frequencies.get(sentiment)
+                    if not token_counts:
+                        continue
                     # Sanitize filename components
                     safe_year = re.sub(r'[^0-9]', '', str(selected_year))
                     safe_aspect = re.sub(r'[^a-zA-Z0-9]', '', str(aspect_id))
                     safe_sentiment = re.sub(r'[^a-zA-Z0-9]', '', str(sentiment))
                     wordcloud_path = f'static/assets/images/wordcloud/wordcloud_{safe_year}_{safe_aspect}_{safe_sentiment}.png'
-                    wc.to_file(wordcloud_path)
+                    with timed('wordcloud_render'):
+                        wc = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(token_counts)
+                        wc.to_file(wordcloud_path)
                     wordcloud_paths[sentiment] = wordcloud_path
+                wordcloud_cache.set(key, dict(wordcloud_paths))
+
+            has_data = any(wordcloud_paths.values())
 
             # Jika tidak ada data
             if not has_data:
@@ -386,29 +516,18 @@ def process_text():
             if not text:
                 return render_template('error.html', error="Text input is required"), 400
             
-            # Perform sentiment analysis
-            sentiment_prediction = sentiment_model.predict([text])[0]
+            # Analisis sentimen dan topik dengan satu kali preprocessing
+            analysis = inference_service.analyze(text)
 
             # Map 'Positive' and 'Negative'
             sentiment_map = {'netral': 'Netral', 'negatif': 'Negative'}
-            sentimen = sentiment_map.get(sentiment_prediction, 'Unknown')
+            sentimen = sentiment_map.get(analysis['sentiment'], 'Unknown')
 
-            # Perform topic modeling
-            topic_prediction = topic_model.transform([text])[0]
-            
-            doc_vector = topic_prediction  # Use the transformed vector directly
-            top_topic = doc_vector.argmax()
+            # Topik dominan (id topik dimulai dari 1)
+            top_topic = int(analysis['topic_vector'].argmax()) + 1
+            topic = judul_topik.get(top_topic, "Topik Tidak Diketahui")
+            instansi = instansi_mapping.get(top_topic, "Instansi Tidak Diketahui")
 
-            # Initialize variables with defaults
-            topic = "Topik Tidak Diketahui"
-            instansi = "Instansi Tidak Diketahui"
-            
-            if top_topic in judul_topik:
-                topic = judul_topik[top_topic + 1]  # Simpan judul sesuai topik dominan
-                
-            if top_topic in instansi_mapping:
-                instansi = instansi_mapping[top_topic + 1]
-        
             return render_template('index.html', 
                                    content='analyze/resultTextAnalyzing.html',
                                    active_page='analyze',
@@ -420,18 +539,153 @@ def process_text():
         print(f"Process text error: {e}")
         return render_template('error.html', error="Failed to process text"), 500
 
+# Prediksi JSON untuk sistem lain; permintaan bersamaan digabung oleh MicroBatcher
+PREDICT_MAX_TEXTS = int(os.getenv('PREDICT_MAX_TEXTS', '1000'))
+
+def predict_batch(texts):
+    """Sentimen, topik dominan dan distribusi topik untuk setiap teks."""
+    analysis = inference_service.analyze_batch(texts)
+    predictions = []
+    for sentiment, topic_vector in zip(analysis['sentiments'], analysis['topic_vectors']):
+        top_topic = int(topic_vector.argmax()) + 1
+        predictions.append({
+            'sentiment': sentiment,
+            'topic_id': top_topic,
+            'topic': judul_topik.get(top_topic, 'Topik Tidak Diketahui'),
+            'instansi': instansi_mapping.get(top_topic, 'Instansi Tidak Diketahui'),
+            'topic_distribution': [float(probability) for probability in topic_vector]
+        })
+    return predictions
+
+predict_batcher = MicroBatcher(
+    predict_batch,
+    max_batch_size=int(os.getenv('PREDICT_MAX_BATCH_SIZE', '64')),
+    max_wait=float(os.getenv('PREDICT_MAX_WAIT_MS', '10')) / 1000
+)
+
+@app.route('/api/predict', methods=['POST'])
+def api_predict():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+
+    # Terima {"texts": [...]} atau {"text": "..."}
+    texts = data.get('texts')
+    if texts is None and 'text' in data:
+        texts = [data['text']]
+    if not isinstance(texts, list) or not texts:
+        return jsonify({'error': "'texts' must be a non-empty list of strings"}), 400
+    if len(texts) > PREDICT_MAX_TEXTS:
+        return jsonify({'error': f"At most {PREDICT_MAX_TEXTS} texts per request"}), 400
+    if not all(isinstance(text, str) and text.strip() for text in texts):
+        return jsonify({'error': "'texts' must be a non-empty list of strings"}), 400
+    if inference_service is None:
+        return jsonify({'error': 'Models are not loaded'}), 503
+
+    try:
+        predictions = predict_batcher.submit([text.strip() for text in texts])
+    except Exception as e:
+        print(f"Predict API error: {e}")
+        return jsonify({'error': 'Failed to process texts'}), 500
+    return jsonify({'predictions': predictions})
+
+@app.route('/api/predict/stats')
+def api_predict_stats():
+    return jsonify(predict_batcher.stats())
+
 @app.context_processor
 def utility_processor():
     return dict(enumerate=enumerate)
 
-# Variabel Global untuk Menyimpan Hasil Proses
-processed_results = []
+# Pekerjaan analisis file dijalankan di background; hasilnya dibaca per job_id.
+# Status job ditulis di samping file hasilnya agar terbaca oleh semua worker
+UPLOAD_DIR = os.getenv('UPLOAD_DIR', os.path.join('uploads', 'jobs'))
+job_manager = JobManager(
+    max_workers=int(os.getenv('JOB_WORKERS', '2')),
+    max_jobs=int(os.getenv('JOB_HISTORY', '20')),
+    state_dir=RESULT_STORE_DIR,
+    open_result=ResultStore
+)
+
+# Jumlah baris hasil yang ditampilkan langsung di halaman hasil analisis
+RESULT_PREVIEW_LIMIT = int(os.getenv('RESULT_PREVIEW_LIMIT', '1000'))
+
+# Jumlah baris per batch INSERT saat menyimpan hasil ke database
+SAVE_BATCH_SIZE = int(os.getenv('SAVE_BATCH_SIZE', '1000'))
+
+def analyze_dataframe(df):
+    """Analisis satu chunk DataFrame dengan satu kali pemanggilan pipeline."""
+    keluhan_chunk = df['keluhan'].tolist()
+    tanggal_chunk = pd.to_datetime(df['tanggal_keluhan']).dt.strftime('%Y-%m-%d %H:%M:%S').tolist()
+
+    # Preprocessing, sentimen dan topik untuk satu chunk sekaligus
+    analysis = inference_service.analyze_batch(keluhan_chunk)
+    preprocessed_chunk = analysis['tokens']
+    sentiment_chunk = analysis['sentiments']
+    top_topics = analysis['topic_vectors'].argmax(axis=1) + 1
+
+    results = []
+    for offset, keluhan in enumerate(keluhan_chunk):
+        top_topic = int(top_topics[offset])
+        results.append({
+            'tanggal': tanggal_chunk[offset],
+            'keluhan': keluhan,
+            'preprocessed_text': json.dumps(preprocessed_chunk[offset]),
+            'sentimen': {'netral': 'Netral', 'negatif': 'Negatif'}.get(sentiment_chunk[offset], 'Unknown'),
+            'topik': judul_topik.get(top_topic, 'Topik Tidak Diketahui'),
+            'instansi': instansi_mapping.get(top_topic, 'Topik Tidak Diketahui')
+        })
+    return results
+
+def analyze_upload(file, filename, store, chunk_size=None, progress=None):
+    """Baca, analisis dan simpan file unggahan per chunk.
+
+    Setiap chunk berisi ``chunk_size`` baris dan langsung ditulis ke
+    ``store``, sehingga memori puncak dibatasi ukuran chunk, bukan ukuran
+    file. ``progress(rows_done)`` dipanggil setelah setiap chunk.
+    Mengembalikan jumlah baris dan throughput dalam baris per detik.
+    """
+    chunk_size = max(1, int(chunk_size or BATCH_CHUNK_SIZE))
+
+    total_rows = 0
+    start_time = time.perf_counter()
+    for chunk in iter_upload_chunks(file, filename, chunk_size):
+        store.append(analyze_dataframe(chunk))
+        total_rows += len(chunk)
+        if progress is not None:
+            progress(total_rows)
+
+    elapsed = time.perf_counter() - start_time
+    rows_per_sec = total_rows / elapsed if elapsed > 0 else 0.0
+    print(f"Analyzed {total_rows} rows in {elapsed:.2f}s ({rows_per_sec:.1f} rows/sec, chunk_size={chunk_size})")
+    return total_rows, rows_per_sec
+
+def run_analysis_job(job, path, filename):
+    """Isi pekerjaan background: analisis file di ``path`` ke ResultStore baru."""
+    store = ResultStore()
+    job.add_cleanup(store.delete)
+    try:
+        with open(path, 'rb') as file:
+            analyze_upload(file, filename, store, progress=job.update_progress)
+    except Exception:
+        store.delete()
+        raise
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return store
+
+def get_job_results(job_id):
+    """ResultStore milik job yang sudah selesai, atau None."""
+    job = job_manager.get(job_id) if job_id else None
+    if job is None or job.status != 'done':
+        return None
+    return job.result
 
 @app.route('/process_file', methods=['POST'])
 def process_file():
-    global processed_results
-    processed_results = []  # Reset data sebelumnya
-
     try:
         if 'fileUpload' not in request.files:
             return "No file part", 400
@@ -440,202 +694,126 @@ def process_file():
         if file.filename == '':
             return "No selected file", 400
 
-        if file:
-            # Load file ke DataFrame with error handling
-            try:
-                if file.filename.endswith('.xlsx'):
-                    df = pd.read_excel(file)
-                elif file.filename.endswith('.csv'):
-                    df = pd.read_csv(file)
-                else:
-                    return "Unsupported file format. Please use Excel or CSV.", 400
-                    
-                # Validate required columns
-                required_columns = ['keluhan', 'tanggal_keluhan']
-                if not all(col in df.columns for col in required_columns):
-                    return f"Missing required columns: {required_columns}", 400
-                    
-            except Exception as e:
-                return f"Error reading file: {str(e)}", 400
-
-        # Preprocess dan Analisis Data
-        for _, row in df.iterrows():
-            keluhan = row['keluhan']
-            tanggal = pd.to_datetime(row['tanggal_keluhan']).strftime('%Y-%m-%d %H:%M:%S') # string ke datetime
-
-            # Preprocessing Keluhan
-            preprocessor = topic_model.named_steps['preprocessor']
-            preprocessed = preprocessor.transform([keluhan])[0]  # Hasilnya berupa list
-            preprocessed_text = json.dumps(preprocessed)  # Konversi list ke string JSON
-            
-            # Analisis Sentimen
-            sentiment_prediction = sentiment_model.predict([keluhan])[0]
-            sentimen = {'netral': 'Netral', 'negatif': 'Negatif'}.get(sentiment_prediction, 'Unknown')
-
-            # Analisis Topik
-            topic_prediction = topic_model.transform([keluhan])[0]
-            top_topic = topic_prediction.argmax()
-            topic_label = judul_topik.get(top_topic + 1, 'Topik Tidak Diketahui')
-            instansi_label = instansi_mapping.get(top_topic + 1, 'Topik Tidak Diketahui')
-            
-
-            processed_results.append({
-                'tanggal': tanggal,
-                'keluhan': keluhan,
-                'preprocessed_text': preprocessed_text,
-                'sentimen': sentimen,
-                'topik': topic_label,
-                'instansi': instansi_label
-            })
-
-            # Tampilkan di halaman hasil
-            return render_template('index.html', 
-                                   content='analyze/resultFileAnalyzing.html',
-                                   active_page='analyze',
-                                   results=processed_results)
+        filename = file.filename
+        if not filename.endswith(('.xlsx', '.csv')):
+            return "Unsupported file format. Please use Excel or CSV.", 400
+
+        # Simpan file ke disk agar bisa diproses setelah request selesai
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        job = Job(filename)
+        path = os.path.join(UPLOAD_DIR, job.id + os.path.splitext(filename)[1])
+        file.save(path)
+        job.total_rows = estimate_total_rows(path, filename)
+
+        job_manager.submit(job, run_analysis_job, path, filename)
+
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify({
+                'job_id': job.id,
+                'status_url': url_for('job_status', job_id=job.id)
+            }), 202
+        return redirect(url_for('job_progress', job_id=job.id))
     except Exception as e:
         print(f"Process file error: {e}")
         return f"Error processing file: {str(e)}", 500
 
+@app.route('/jobs/<job_id>')
+def job_progress(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return render_template('404.html'), 404
+    return render_template('index.html',
+                           content='analyze/jobProgress.html',
+                           active_page='analyze',
+                           job=job.progress())
+
+@app.route('/jobs/<job_id>/status')
+def job_status(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.progress())
+
+@app.route('/jobs/<job_id>/results')
+def job_results(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return render_template('404.html'), 404
+    if job.status == 'failed':
+        return render_template('error.html', error=f"Error processing file: {job.error}"), 400
+    if job.status != 'done':
+        return redirect(url_for('job_progress', job_id=job_id))
+
+    progress = job.progress()
+    return render_template('index.html',
+                           content='analyze/resultFileAnalyzing.html',
+                           active_page='analyze',
+                           job_id=job_id,
+                           results=job.result.head(RESULT_PREVIEW_LIMIT),
+                           parquet_available=parquet_available(),
+                           total_rows=progress['rows_done'],
+                           rows_per_sec=progress['rows_per_sec'])
+
 @app.route('/export_excel', methods=['GET'])
 def export_excel():
-    output = None
     try:
-        global processed_results
-        if not processed_results:
+        results = get_job_results(request.args.get('job_id'))
+        if not results:
             return "No data to export", 400
 
-        # Convert processed_results ke DataFrame
-        df = pd.DataFrame(processed_results)
-
-        # Save ke Excel with proper resource management
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(writer, index=False, sheet_name='Processed Results')
-
-        output.seek(0)
-        response_data = output.getvalue()
+        # Ditulis ke file sementara (memori konstan) lalu dikirim per blok
+        blocks, size = write_xlsx(results)
         return Response(
-            response_data,
+            blocks,
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            headers={"Content-Disposition": "attachment;filename=processed_results.xlsx"}
+            headers={
+                "Content-Disposition": "attachment;filename=processed_results.xlsx",
+                "Content-Length": str(size)
+            }
         )
     except Exception as e:
         print(f"Export Excel error: {e}")
         return "Failed to export Excel file", 500
-    finally:
-        if output:
-            output.close()
+
+@app.route('/export_csv', methods=['GET'])
+def export_csv():
+    results = get_job_results(request.args.get('job_id'))
+    if not results:
+        return "No data to export", 400
+
+    return Response(
+        iter_csv(results),
+        mimetype='text/csv',
+        headers={"Content-Disposition": "attachment;filename=processed_results.csv"}
+    )
+
+@app.route('/export_parquet', methods=['GET'])
+def export_parquet():
+    if not parquet_available():
+        return "Parquet export requires pyarrow", 501
+
+    results = get_job_results(request.args.get('job_id'))
+    if not results:
+        return "No data to export", 400
+
+    return Response(
+        iter_parquet(results),
+        mimetype='application/vnd.apache.parquet',
+        headers={"Content-Disposition": "attachment;filename=processed_results.parquet"}
+    )
 
 @app.route('/export_pdf', methods=['GET'])
 def export_pdf():
-    output = None
     try:
-        global processed_results
-        if not processed_results:
+        results = get_job_results(request.args.get('job_id'))
+        if not results:
             return "No data to export", 400
+        start_time = time.perf_counter()
 
         # Menghitung jumlah sentimen negatif dan netral berdasarkan topik
-        summary = {}
-        total_negatif = 0
-        total_netral = 0
-
-        for record in processed_results:
-            topik = record['topik']
-            sentimen = record['sentimen'].lower()  # Normalize to lowercase
-
-            if topik not in summary:
-                summary[topik] = {'negatif': 0, 'netral': 0}
-
-            if sentimen in summary[topik]:
-                summary[topik][sentimen] += 1
-
-        # Hitung total
-        for counts in summary.values():
-            total_negatif += counts['negatif']
-            total_netral += counts['netral']
-
-        # Output stream
-        output = io.BytesIO()
-        pdf = SimpleDocTemplate(output, pagesize=landscape(A4),
-                                leftMargin=1 * cm, rightMargin=1 * cm,
-                                topMargin=2.5 * cm, bottomMargin=2 * cm)
-        elements = []
-
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = styles['Heading1']
-        subtitle_style = styles['Normal']
-        subtitle_style.spaceAfter = 12
-        subtitle_style.spaceBefore = 12
-
-        # Header
-        current_date = datetime.now().strftime("%d %B %Y, %H:%M:%S")
-        header_title = Paragraph("Laporan Analisis Sentimen Berbasis Aspek", title_style)
-        header_subtitle = Paragraph(f"Kota Surabaya - Tanggal Pembuatan: {current_date}", subtitle_style)
-        header_description = Paragraph(
-            "Laporan ini menyajikan jumlah sentimen negatif dan netral berdasarkan aspek/topik "
-            "pengaduan warga Kota Surabaya.", subtitle_style)
-        elements.extend([header_title, header_subtitle, header_description, Spacer(1, 0.5 * cm)])
-
-        # Define column widths
-        col_widths = [14 * cm, 4 * cm, 4 * cm]
-
-        # Header dan data tabel
-        data = [['Aspek/Topik', 'Jumlah Sentimen Negatif', 'Jumlah Sentimen Netral']]
-        for topik, counts in summary.items():
-            data.append([
-                topik,
-                counts['negatif'],
-                counts['netral']
-            ])
-
-        # Tambahkan total
-        data.append(['Total', total_negatif, total_netral])
-
-        # Buat tabel
-        table = Table(data, colWidths=col_widths)
-
-        # Gaya tabel
-        style = TableStyle([
-            # Header style
-            ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-
-            # Data style
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),  # Align jumlah
-            ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
-            ('TEXTCOLOR', (0, 1), (-1, -2), colors.black),
-            ('LINEBELOW', (0, 1), (-1, -2), 0.25, colors.grey),
-
-            # Total row style
-            ('BACKGROUND', (0, -1), (-1, -1), colors.lightblue),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('ALIGN', (0, -1), (-1, -1), 'CENTER'),
-
-            # Table borders
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ])
-        table.setStyle(style)
-
-        # Tambahkan tabel ke elemen
-        elements.append(table)
-
-        # Footer
-        footer_note = Paragraph(
-            "Laporan ini dihasilkan oleh sistem analisis sentimen berbasis aspek "
-            "untuk pengaduan warga Kota Surabaya.", subtitle_style)
-        elements.extend([Spacer(1, 1 * cm), footer_note])
-
-        # Bangun PDF
-        pdf.build(elements)
-        output.seek(0)
-        response_data = output.getvalue()
+        summary = summarize_batches(results.iter_batches(EXPORT_BATCH_SIZE))
+        response_data = build_summary_pdf(summary)
+        observe_stage('export_pdf', time.perf_counter() - start_time, items=len(results))
 
         return Response(
             response_data,
@@ -645,9 +823,52 @@ def export_pdf():
     except Exception as e:
         print(f"Export PDF error: {e}")
         return "Failed to export PDF file", 500
-    finally:
-        if output:
-            output.close()
+
+# Cache bytes PDF laporan per (rentang, aspek, versi data)
+report_cache = TTLCache(maxsize=int(os.getenv('REPORT_CACHE_SIZE', '64')),
+                        ttl=float(os.getenv('REPORT_CACHE_TTL', '3600')))
+
+@app.route('/report', methods=['GET'])
+def report():
+    try:
+        start, end = report_range(
+            start=request.args.get('start'), end=request.args.get('end'),
+            year=request.args.get('year'), month=request.args.get('month'))
+    except (ValueError, OverflowError) as e:
+        return str(e), 400
+
+    aspect_id = request.args.get('aspect_id') or 'all'
+    if not (aspect_id == 'all' or aspect_id.isdigit()):
+        return "Invalid aspect ID", 400
+
+    try:
+        connection = ensure_connection()
+        key = ('report', start, end, aspect_id, data_version.refresh(connection))
+        pdf_bytes = report_cache.get(key)
+        if pdf_bytes is None:
+            aspect_name = None
+            if aspect_id != 'all':
+                aspect_name = fetch_aspect_name(connection, aspect_id)
+                if aspect_name is None:
+                    return "Unknown aspect ID", 404
+
+            # Agregasi di SQL; hanya tabel aspek x sentimen yang dibaca
+            counts = fetch_report_counts(connection, start, end, aspect_id)
+            with timed('report_pdf'):
+                pdf_bytes = build_summary_pdf(summarize_counts(counts), period=(start, end), aspect=aspect_name)
+            report_cache.set(key, pdf_bytes)
+    except Exception as e:
+        print(f"Report error: {e}")
+        return "Failed to generate report", 500
+
+    filename = f"laporan_sentimen_{start:%Y%m%d}_{end - timedelta(days=1):%Y%m%d}"
+    if aspect_id != 'all':
+        filename += f"_aspek{aspect_id}"
+    return Response(
+        pdf_bytes,
+        mimetype='application/pdf',
+        headers={"Content-Disposition": f"attachment;filename={filename}.pdf"}
+    )
 
 @app.route('/save_to_database', methods=['POST'])
 def save_to_database():
@@ -672,55 +893,60 @@ def save_to_database():
         connection = ensure_connection()
         cursor = connection.cursor()
 
-        # Mengambil data hasil analisis dari global processed_results
-        global processed_results
-        if not processed_results:
+        # Mengambil data hasil analisis dari job yang dipilih
+        results = get_job_results(data.get('job_id'))
+        if not results:
             return {"success": False, "message": "Tidak ada data untuk disimpan!"}, 400
 
         # Fetch all aspects once to avoid N+1 query problem
         cursor.execute("SELECT aspect, aspect_id FROM aspect")
         aspect_mapping = {row[0]: row[1] for row in cursor.fetchall()}
 
-        # Normalisasi data di processed_results untuk konsistensi
-        for row in processed_results:
-            row['tanggal'] = pd.to_datetime(row['tanggal']).strftime('%Y-%m-%d %H:%M:%S')
-            row['keluhan'] = row['keluhan'].strip().lower()
-
-        # Ambil seluruh data tanggal_keluhan dan keluhan di database untuk pengecekan
-        cursor.execute("SELECT DATE_FORMAT(tanggal_keluhan, '%Y-%m-%d %H:%i:%s'), LOWER(keluhan) FROM sentiment_analysis")
-        existing_data = set((row[0], row[1]) for row in cursor.fetchall())
-
-        # Filter data untuk hanya menyimpan baris baru
-        rows_to_insert = []
-        for row in processed_results:
-            # Get aspect_id from mapping
-            aspect_id = aspect_mapping.get(row['topik'])
-            if not aspect_id:
-                return {"success": False, "message": f"Aspek {row['topik']} tidak ditemukan dalam database!"}, 400
-            
-            key = (row['tanggal'], row['keluhan'])
-
-            if key not in existing_data:
-                rows_to_insert.append((
-                    row['sentimen'].lower(),  # sentimen
-                    row['tanggal'],          # tanggal_keluhan
-                    row['keluhan'],          # keluhan
-                    row['preprocessed_text'],  # preprocessed_text
-                    aspect_id                # aspect_id
+        # Baca hasil dari disk per batch; duplikat dicek lewat unique index content_hash
+        inserted_rows = 0
+        skipped_rows = 0
+        for batch in results.iter_batches(SAVE_BATCH_SIZE):
+            rows = []
+            for row in batch:
+                # Get aspect_id from mapping
+                aspect_id = aspect_mapping.get(row['topik'])
+                if not aspect_id:
+                    connection.rollback()
+                    return {"success": False, "message": f"Aspek {row['topik']} tidak ditemukan dalam database!"}, 400
+
+                # Normalisasi untuk konsistensi (tanggal sudah diformat saat analisis)
+                rows.append((
+                    row['sentimen'].lower(),           # sentimen
+                    row['tanggal'],                    # tanggal_keluhan
+                    normalize_keluhan(row['keluhan']),  # keluhan
+                    row['preprocessed_text'],          # preprocessed_text
+                    aspect_id                          # aspect_id
                 ))
 
-        # Jika ada data untuk di-insert, lakukan insert batch
-        if rows_to_insert:
-            insert_query = """
-                INSERT INTO sentiment_analysis 
-                (sentimen, tanggal_keluhan, keluhan, preprocessed_text, aspect_id)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            cursor.executemany(insert_query, rows_to_insert)
+            with timed('db_write', items=len(rows)):
+                new_rows, skipped = insert_new_rows(cursor, rows)
+                if new_rows:
+                    # Perbarui rollup frekuensi token hanya untuk baris baru, dalam transaksi yang sama
+                    upsert_term_frequencies(cursor, count_terms(
+                        (row[1], row[4], row[0], row[3]) for row in new_rows
+                    ))
+            skipped_rows += skipped
+            inserted_rows += len(rows) - skipped
+
+        if inserted_rows:
+            # Data berubah: versi dinaikkan dalam transaksi yang sama sehingga
+            # cache semua worker untuk versi lama tidak dipakai lagi
+            data_version.bump(cursor)
             connection.commit()
+            data_version.invalidate()
 
         cursor.close()
-        return {"success": True, "message": f"Data berhasil disimpan ke database! {len(rows_to_insert)} baris ditambahkan."}, 200
+        return {
+            "success": True,
+            "message": f"Data berhasil disimpan ke database! {inserted_rows} baris ditambahkan, {skipped_rows} duplikat dilewati.",
+            "inserted": inserted_rows,
+            "skipped": skipped_rows
+        }, 200
 
     except mysql.connector.Error as e:
         if 'connection' in locals():
@@ -731,6 +957,55 @@ def save_to_database():
             connection.rollback()
         return {"success": False, "message": f"Gagal menyimpan data: {e}"}, 500
 
+@app.route('/model_stats')
+def model_stats_route():
+    # Waktu muat model dan memori worker ini (PSS menunjukkan bagian yang dibagi antar worker)
+    cache = inference_service.cache if inference_service is not None else None
+    return jsonify({
+        **model_stats,
+        'memory': memory_usage(),
+        'prediction_cache': cache.stats() if cache is not None else None,
+        'stem_cache': stem_cache_stats()
+    })
+
+def stem_cache_stats():
+    # Termasuk kata yang di-stem di worker pool (PREPROCESS_N_JOBS > 1)
+    return stem_preprocessor.stem_cache_info() if topic_model is not None else None
+
+def _stats_gauge(*sources):
+    # Ubah dict statistik menjadi nilai gauge berlabel; nilai non-angka dilewati
+    values = {}
+    for name, stats in sources:
+        for stat, value in (stats or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[(name, stat) if name else (stat,)] = value
+    return values
+
+registry.gauge('sentimen_db_pool', 'Statistik pool koneksi MySQL',
+               lambda: _stats_gauge((None, get_pool_stats())), ['stat'])
+registry.gauge('sentimen_cache', 'Statistik cache (ukuran, hit, miss, hit rate)',
+               lambda: _stats_gauge(
+                   ('dashboard', dashboard_cache.stats()),
+                   ('wordcloud', wordcloud_cache.stats()),
+                   ('report', report_cache.stats()),
+                   ('prediction', inference_service.cache.stats()
+                    if inference_service is not None and inference_service.cache is not None else None),
+                   ('stem', stem_cache_stats())
+               ), ['cache', 'stat'])
+registry.gauge('sentimen_predict_batcher', 'Statistik micro-batching /api/predict',
+               lambda: _stats_gauge((None, predict_batcher.stats())), ['stat'])
+registry.gauge('sentimen_jobs', 'Jumlah job analisis file per status',
+               lambda: {(status,): count for status, count in job_manager.counts().items()}, ['status'])
+registry.gauge('sentimen_data_version', 'Versi data keluhan (naik setiap insert)', lambda: data_version.value)
+
+@app.route('/metrics')
+def metrics():
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/db_pool_stats')
+def db_pool_stats():
+    return jsonify(get_pool_stats())
+
 @app.route('/documentation')
 def documentation():
     return render_template('index.html', active_page='documentation', content='documentation/documentation.html')
@@ -743,6 +1018,9 @@ def page_not_found(e):
 def internal_server_error(e):
     return render_template('error.html', error="Internal server error occurred"), 500
 
+if os.getenv('DASHBOARD_PREWARM', 'False').lower() == 'true':
+    prewarm_dashboard_cache()
+
 if __name__ == '__main__':
     debug_mode = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     app.run(debug=debug_mode)
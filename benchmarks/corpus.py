@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+# Potongan kalimat keluhan warga; dikombinasikan secara acak (dengan seed)
+SUBJECTS = [
+    'jalan', 'lampu penerangan jalan', 'saluran air', 'got', 'trotoar', 'taman kota', 'pohon',
+    'parkir liar', 'sampah', 'pelayanan kelurahan', 'antrian puskesmas', 'sekolah', 'pdam',
+    'pengurusan ktp', 'kartu keluarga', 'bpjs', 'pasar', 'jembatan', 'halte bus', 'drainase'
+]
+PLACES = [
+    'di depan rumah', 'di gang 3', 'di rt 05 rw 02', 'dekat masjid', 'di jalan raya darmo',
+    'sebelah pasar', 'di perumahan kami', 'depan sekolah', 'di kelurahan', 'di kecamatan'
+]
+PROBLEMS = [
+    'rusak parah', 'berlubang', 'mati total', 'tersumbat', 'banjir kalau hujan', 'tidak ada petugas',
+    'antri lama sekali', 'tumbang menutup jalan', 'menumpuk dan bau', 'tidak jelas prosesnya',
+    'dipungut biaya', 'belum ada tindak lanjut', 'petugasnya tidak ramah', 'sering error'
+]
+DURATIONS = [
+    'sudah 2 minggu', 'sejak bulan lalu', 'dari kemarin', 'sudah lama', 'hampir setahun', 'tiap hari'
+]
+REQUESTS = [
+    'mohon segera diperbaiki', 'tolong ditindaklanjuti', 'mohon bantuannya', 'harap diperhatikan',
+    'kapan diselesaikan', 'mohon informasinya', 'tolong dicek pak', ''
+]
+# Kata tidak baku, tautan dan emoji untuk melatih jalur normalisasi dan cleaning
+NOISE = [
+    'gk', 'tdk', 'udh', 'blm', 'bgt', 'yg', 'sdh', 'tlg', 'trs', 'krn',
+    'https://lapor.example.go.id/123', '😡', '🙏', '!!!', '??', '<br>'
+]
+
+ASPECTS = [
+    'Kualitas Pelayanan Masyarakat', 'Pengaduan dan Penyelesaian Keluhan', 'Masalah Lingkungan di Sekitar',
+    'Proses Administrasi dan Informasi Publik', 'Pelaporan dan Tindak Lanjut Masalah',
+    'Kerusakan Fasilitas dan Infrastruktur', 'Pendidikan dan Sekolah', 'Keluhan Kebutuhan Lapangan Pekerjaan',
+    'Permohonan Perbaikan Dan Pembaharuan', 'Proses Pengajuan', 'Permintaan Informasi dan Bantuan',
+    'Durasi dan Efisiensi Layanan', 'Permasalahan Parkir', 'Masalah Pohon dan Gangguan Lingkungan',
+    'Penyelesaian Masalah dan Solusi Keluhan', 'Kondisi Lingkungan', 'Permintaan Dan Pendaftaran'
+]
+
+
+def complaint(rng):
+    parts = [
+        rng.choice(SUBJECTS), rng.choice(PLACES), rng.choice(PROBLEMS),
+        rng.choice(DURATIONS), rng.choice(REQUESTS)
+    ]
+    for _ in range(rng.randint(0, 3)):
+        parts.insert(rng.randint(0, len(parts)), rng.choice(NOISE))
+    text = ' '.join(part for part in parts if part)
+    roll = rng.random()
+    if roll < 0.05:
+        return text.upper()
+    if roll < 0.5:
+        return text.capitalize()
+    return text
+
+
+def generate_texts(n, seed=42):
+    """``n`` teks keluhan sintetis berbahasa Indonesia (deterministik per seed)."""
+    rng = random.Random(seed)
+    return [complaint(rng) for _ in range(n)]
+
+
+def generate_dashboard_rows(n, year=2023, seed=42):
+    """DataFrame baris keluhan (tanggal_keluhan, aspect, sentimen) untuk satu tahun."""
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 365 * 24 * 3600, size=n)
+    return pd.DataFrame({
+        'tanggal_keluhan': pd.Timestamp(f'{year}-01-01') + pd.to_timedelta(seconds, unit='s'),
+        'aspect': pd.Categorical.from_codes(rng.integers(0, len(ASPECTS), size=n), ASPECTS),
+        'sentimen': pd.Categorical.from_codes(rng.integers(0, 2, size=n), ['negatif', 'netral'])
+    })
+
+
+def aggregate_rows(rows):
+    """Agregasi yang sama dengan query dashboard (GROUP BY di SQL)."""
+    sentiment_counts = (rows.groupby(['aspect', 'sentimen'], observed=True).size()
+                        .rename('jumlah').reset_index())
+    monthly_counts = (rows.groupby([rows['tanggal_keluhan'].dt.strftime('%Y-%m').rename('month'), 'aspect'],
+                                   observed=True).size()
+                      .rename('jumlah').reset_index())
+    for counts in (sentiment_counts, monthly_counts):
+        counts['aspect'] = counts['aspect'].astype(str)
+        counts['jumlah'] = counts['jumlah'].astype('int64')
+    sentiment_counts['sentimen'] = sentiment_counts['sentimen'].astype(str)
+    return sentiment_counts, monthly_counts
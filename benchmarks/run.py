@@ -0,0 +1,198 @@
+"""Benchmark preprocessing, inferensi dan builder dashboard.
+
+Contoh:
+    python -m benchmarks.run --output benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.2
+"""
+import argparse
+import copy
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.corpus import generate_texts, generate_dashboard_rows, aggregate_rows
+
+DEFAULT_TEXT_SIZES = [1000, 10000]
+DEFAULT_CHART_SIZES = [10000, 100000, 1000000]
+
+
+def measure(func, repeat, before=None):
+    """Jalankan ``func`` sebanyak ``repeat`` kali; kembalikan durasi (detik)."""
+    durations = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def record(results, name, size, durations):
+    best = min(durations)
+    results[f"{name}[n={size}]"] = {
+        'name': name,
+        'size': size,
+        'best_seconds': best,
+        'median_seconds': statistics.median(durations),
+        'rows_per_sec': size / best if best > 0 else None
+    }
+    print(f"{name:<28} n={size:<9} best={best:.4f}s  median={statistics.median(durations):.4f}s  "
+          f"({size / best if best > 0 else 0:.0f} rows/sec)")
+
+
+def bench_models(results, sizes, repeat, check_parity):
+    from services.model_loader import load_models
+
+    # Tanpa PredictionCache agar yang diukur benar-benar kerja model
+    topic_model, sentiment_model, _, _ = load_models(warmup=True)
+    stem_preprocessor = topic_model.named_steps['preprocessor']
+    plain_preprocessor = sentiment_model.named_steps['preprocessor']
+    lda = topic_model.named_steps['lda']
+
+    for size in sizes:
+        texts = generate_texts(size)
+
+        # Cache stemming dikosongkan tiap ulangan: mengukur kondisi cold start
+        record(results, 'preprocess_stem', size, measure(
+            lambda: stem_preprocessor.transform(texts), repeat, before=stem_preprocessor._reset_stem_cache))
+        record(results, 'preprocess_stem_warm', size, measure(
+            lambda: stem_preprocessor.transform(texts), repeat))
+        record(results, 'preprocess_nostem', size, measure(
+            lambda: plain_preprocessor.transform(texts), repeat))
+
+        tokens = stem_preprocessor.transform(texts)
+        record(results, 'lda_transform', size, measure(lambda: lda.transform(tokens), repeat))
+
+        record(results, 'sentiment_pipeline_predict', size, measure(
+            lambda: sentiment_model.predict(texts), repeat))
+        record(results, 'topic_pipeline_transform', size, measure(
+            lambda: topic_model.transform(texts), repeat))
+
+        if check_parity:
+            legacy = copy.copy(stem_preprocessor)
+            legacy.fused = False
+            legacy.n_jobs = 1
+            for fused_doc, legacy_doc in zip(stem_preprocessor.transform(texts), legacy.transform(texts)):
+                if fused_doc != legacy_doc:
+                    raise SystemExit(f"Parity check failed: {fused_doc!r} != {legacy_doc!r}")
+            print(f"Parity check passed for n={size} (fused == legacy preprocessing)")
+
+
+def bench_charts(results, sizes, repeat):
+    import plotly
+    import app as webapp
+
+    from services.aggregation import summarize_counts, CategoricalCounter
+    from services.chart_payload import compact_charts
+
+    builders = [
+        ('create_summary_table', webapp.create_summary_table),
+        ('create_pie_chart', webapp.create_pie_chart),
+        ('create_bubble_chart', webapp.create_bubble_chart),
+        ('create_stacked_bar_chart', webapp.create_stacked_bar_chart),
+        ('create_line_chart', webapp.create_line_chart),
+    ]
+
+    for size in sizes:
+        rows = generate_dashboard_rows(size)
+        record(results, 'dashboard_aggregate', size, measure(lambda: aggregate_rows(rows), repeat))
+        sentiment_counts, monthly_counts = aggregate_rows(rows)
+
+        # Agregasi baris mentah langsung dengan bincount (jalur export PDF)
+        months = rows['tanggal_keluhan'].dt.strftime('%Y-%m')
+        record(results, 'categorical_counter_rows', size, measure(
+            lambda: CategoricalCounter().add(rows['aspect'], rows['sentimen'])
+            .add_monthly(months, rows['aspect']).summary(), repeat))
+
+        record(results, 'summarize_counts', size, measure(
+            lambda: summarize_counts(sentiment_counts, monthly_counts), repeat))
+        summary = summarize_counts(sentiment_counts, monthly_counts)
+
+        for name, builder in builders:
+            record(results, name, size, measure(lambda: builder(summary), repeat))
+
+        def render_all():
+            for _, builder in builders[1:]:
+                figure = builder(summary)
+                json.dumps(figure[0] if isinstance(figure, tuple) else figure, cls=plotly.utils.PlotlyJSONEncoder)
+        record(results, 'dashboard_charts_json', size, measure(render_all, repeat))
+
+        # Payload ringkas /dashboard/charts (template dipisah, typed array)
+        figures = {name: builder(summary) for name, builder in builders[1:]}
+        figures['create_pie_chart'] = figures['create_pie_chart'][0]
+        record(results, 'dashboard_charts_compact', size, measure(lambda: compact_charts(figures), repeat))
+
+
+def compare(results, baseline_path, threshold):
+    """Bandingkan dengan baseline; kembalikan daftar benchmark yang melambat."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    print(f"\nPerbandingan dengan {baseline_path} (ambang {threshold:.0%}):")
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            print(f"  {key:<40} baru")
+            continue
+        ratio = current['best_seconds'] / previous['best_seconds'] if previous['best_seconds'] else float('inf')
+        status = 'REGRESI' if ratio > 1 + threshold else 'ok'
+        print(f"  {key:<40} {previous['best_seconds']:.4f}s -> {current['best_seconds']:.4f}s "
+              f"({ratio:.2f}x) {status}")
+        if status != 'ok':
+            regressions.append(key)
+    return regressions
+
+
+def parse_sizes(value):
+    return [int(size) for size in value.split(',') if size]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing, inferensi dan dashboard")
+    parser.add_argument('--text-sizes', type=parse_sizes, default=DEFAULT_TEXT_SIZES,
+                        help="jumlah teks untuk benchmark model, dipisah koma")
+    parser.add_argument('--chart-sizes', type=parse_sizes, default=DEFAULT_CHART_SIZES,
+                        help="jumlah baris untuk benchmark dashboard, dipisah koma")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', choices=['models', 'charts'], help="jalankan satu kelompok saja")
+    parser.add_argument('--check-parity', action='store_true',
+                        help="pastikan preprocessing fused sama dengan jalur bertahap")
+    parser.add_argument('--output', help="simpan hasil sebagai baseline JSON")
+    parser.add_argument('--compare', help="baseline JSON untuk dibandingkan")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="batas perlambatan relatif sebelum dianggap regresi (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if args.only in (None, 'models'):
+        bench_models(results, args.text_sizes, args.repeat, args.check_parity)
+    if args.only in (None, 'charts'):
+        bench_charts(results, args.chart_sizes, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'created_at': datetime.now().isoformat(timespec='seconds'),
+                    'python': sys.version.split()[0],
+                    'platform': platform.platform(),
+                    'repeat': args.repeat
+                },
+                'results': results
+            }, f, indent=2)
+        print(f"\nHasil disimpan ke {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark melambat lebih dari {args.threshold:.0%}")
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
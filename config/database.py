@@ -1,5 +1,9 @@
-import mysql.connector
 import os
+import queue
+import threading
+import time
+
+import mysql.connector
 
 # Database configuration using environment variables
 config = {
@@ -9,13 +13,166 @@ config = {
     'database': os.getenv('DB_NAME', 'db_sentimen')
 }
 
+# Pool configuration using environment variables
+pool_config = {
+    'size': int(os.getenv('DB_POOL_SIZE', '5')),
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+    # Koneksi yang menganggur lebih lama dari ini di-ping sebelum dipakai
+    'health_check_interval': float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', '30'))
+}
+
+
+class ConnectionPool:
+    """Pool koneksi MySQL berukuran tetap dengan health check saat checkout."""
+
+    def __init__(self, size, timeout, health_check_interval, **connect_args):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.connect_args = connect_args
+
+        # Berisi (connection, waktu dikembalikan); LIFO agar koneksi hangat dipakai lebih dulu
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._checkouts = 0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+
+    def acquire(self):
+        start = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+        try:
+            connection = self._checkout()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._checkout_time_total += elapsed
+            self._checkout_time_max = max(self._checkout_time_max, elapsed)
+        return connection
+
+    def _checkout(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                connection, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve_slot():
+                    return self._connect()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise mysql.connector.errors.PoolError("Connection pool exhausted")
+                try:
+                    connection, released_at = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    raise mysql.connector.errors.PoolError("Connection pool exhausted")
+
+            if self._is_healthy(connection, released_at):
+                return connection
+            self._discard(connection)
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return True
+            return False
+
+    def _connect(self):
+        try:
+            return mysql.connector.connect(**self.connect_args)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _is_healthy(self, connection, released_at):
+        if time.monotonic() - released_at < self.health_check_interval:
+            return True
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    def release(self, connection):
+        with self._lock:
+            self._in_use -= 1
+        try:
+            # Akhiri transaksi terbuka agar permintaan berikutnya melihat data terbaru
+            if connection.in_transaction:
+                connection.rollback()
+        except mysql.connector.Error:
+            self._discard(connection)
+            return
+        self._idle.put((connection, time.monotonic()))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+                'waiting': self._waiting,
+                'checkouts': self._checkouts,
+                'checkout_time_avg_ms': (self._checkout_time_total / self._checkouts * 1000) if self._checkouts else 0.0,
+                'checkout_time_max_ms': self._checkout_time_max * 1000
+            }
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool, _pool_pid
+    # Pool milik proses induk (mis. master gunicorn setelah prewarm) tidak
+    # dipakai setelah fork: socket-nya akan dipakai bersama oleh semua worker
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool(**pool_config, **config)
+                _pool_pid = os.getpid()
+    return _pool
+
+def reset_pool():
+    """Lupakan pool warisan proses induk; dipanggil di worker setelah fork.
+
+    Koneksi lama tidak ditutup karena socket-nya masih milik proses induk.
+    """
+    global _pool, _pool_pid, _pool_lock
+    _pool = None
+    _pool_pid = None
+    _pool_lock = threading.Lock()
+
 def get_connection():
     try:
-        # Establish connection
-        connection = mysql.connector.connect(**config)
-        if connection.is_connected():
-            print('Connected to MySQL database')
-            return connection
+        # Ambil koneksi dari pool; kembalikan dengan release_connection()
+        return get_pool().acquire()
     except mysql.connector.Error as error:
         print(f'Failed to connect to MySQL database: {error}')
-        return None
\ No newline at end of file
+        return None
+
+def release_connection(connection):
+    if connection is not None:
+        get_pool().release(connection)
+
+def get_pool_stats():
+    return get_pool().stats()
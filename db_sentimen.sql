@@ -17,13 +17,41 @@ CREATE TABLE sentiment_analysis (
     tanggal_keluhan DATETIME NOT NULL,
     keluhan TEXT NOT NULL,
     preprocessed_text TEXT,
+    -- SHA-256 dari (tanggal_keluhan, keluhan) ternormalisasi, lihat services/dedup.py
+    content_hash CHAR(64) CHARACTER SET ascii NOT NULL,
     sentimen ENUM('negatif', 'netral') NOT NULL,
     aspect_id INT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    UNIQUE KEY uq_sentiment_analysis_content_hash (content_hash),
+    KEY idx_sentiment_analysis_tanggal (tanggal_keluhan, aspect_id, sentimen),
+    KEY idx_sentiment_analysis_aspect_tanggal (aspect_id, tanggal_keluhan, sentimen),
     
     -- Definisi foreign key
     FOREIGN KEY (aspect_id) REFERENCES aspect(aspect_id)
         ON DELETE CASCADE
         ON UPDATE CASCADE
-);
\ No newline at end of file
+);
+
+-- Membuat tabel rollup frekuensi token (lihat migrations/001_term_frequency.sql)
+CREATE TABLE term_frequency (
+    tahun SMALLINT NOT NULL,
+    bulan TINYINT NOT NULL,
+    aspect_id INT NOT NULL,
+    sentimen ENUM('negatif', 'netral') NOT NULL,
+    token VARCHAR(100) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    frekuensi INT UNSIGNED NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (tahun, bulan, aspect_id, sentimen, token),
+    KEY idx_term_frequency_aspect (aspect_id, tahun)
+);
+
+-- Versi data untuk invalidasi cache antar worker (lihat migrations/004_data_version.sql)
+CREATE TABLE data_version (
+    id TINYINT UNSIGNED NOT NULL PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+);
+
+INSERT INTO data_version (id, version) VALUES (1, 0);
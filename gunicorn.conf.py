@@ -0,0 +1,32 @@
+# Konfigurasi gunicorn: model dimuat sekali di master lalu dibagi ke worker
+#   gunicorn app:app -c gunicorn.conf.py
+import gc
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', '4'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+
+# Import app (dan muat model) di master sebelum fork; worker mewarisi
+# halaman memori model secara copy-on-write
+preload_app = True
+
+
+def when_ready(server):
+    # Pindahkan objek hasil load ke generasi permanen agar GC di worker tidak
+    # menulis ke header objek (yang akan menyalin halaman bersama)
+    gc.freeze()
+    from services.model_loader import memory_usage
+    server.log.info(f"Master ready: {memory_usage()}")
+
+
+def post_fork(server, worker):
+    # Koneksi database hasil prewarm di master tidak boleh dipakai bersama worker
+    from config.database import reset_pool
+    reset_pool()
+
+
+def post_worker_init(worker):
+    from services.model_loader import memory_usage
+    worker.log.info(f"Worker {worker.pid} memory: {memory_usage()}")
@@ -0,0 +1,16 @@
+-- Rollup frekuensi token untuk word cloud dan tampilan "top words"
+-- Diisi secara inkremental oleh save_to_database dan insert.py.
+-- Untuk data yang sudah ada jalankan: python -m services.term_frequency --rebuild
+USE db_sentimen;
+
+CREATE TABLE IF NOT EXISTS term_frequency (
+    tahun SMALLINT NOT NULL,
+    bulan TINYINT NOT NULL,
+    aspect_id INT NOT NULL,
+    sentimen ENUM('negatif', 'netral') NOT NULL,
+    token VARCHAR(100) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    frekuensi INT UNSIGNED NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (tahun, bulan, aspect_id, sentimen, token),
+    KEY idx_term_frequency_aspect (aspect_id, tahun)
+);
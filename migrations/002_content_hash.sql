@@ -0,0 +1,40 @@
+-- Deduplikasi sentiment_analysis berbasis hash isi (tanggal_keluhan, keluhan)
+-- Ekspresi hash harus sama dengan services.dedup.content_hash.
+-- Setelah migrasi jalankan: python -m services.term_frequency --rebuild
+-- karena baris duplikat lama ikut terhapus.
+USE db_sentimen;
+
+ALTER TABLE sentiment_analysis
+    ADD COLUMN content_hash CHAR(64) CHARACTER SET ascii NULL AFTER preprocessed_text;
+
+UPDATE sentiment_analysis
+SET content_hash = SHA2(CONCAT(
+    DATE_FORMAT(tanggal_keluhan, '%Y-%m-%d %H:%i:%s'),
+    CHAR(31 USING utf8mb4),
+    LOWER(TRIM(keluhan))
+), 256);
+
+-- Index sementara agar penghapusan duplikat tidak memindai seluruh tabel per baris
+ALTER TABLE sentiment_analysis ADD KEY idx_content_hash_tmp (content_hash);
+
+-- Hapus duplikat yang sudah ada, simpan baris dengan id terkecil
+DELETE duplicate
+FROM sentiment_analysis duplicate
+JOIN sentiment_analysis original
+    ON original.content_hash = duplicate.content_hash
+   AND original.id < duplicate.id;
+
+ALTER TABLE sentiment_analysis
+    DROP KEY idx_content_hash_tmp,
+    MODIFY content_hash CHAR(64) CHARACTER SET ascii NOT NULL,
+    ADD UNIQUE KEY uq_sentiment_analysis_content_hash (content_hash);
+
+-- Pemeriksaan: TRIM() hanya membuang spasi, sehingga tab/newline di awal atau
+-- akhir keluhan ikut di-hash. services.dedup.content_hash harus menghasilkan
+-- nilai yang sama (diuji di tests/test_dedup.py):
+--   c2a95b2b5a53cff0df51f6edc63a8f60e522b60a263fa15f163a38f890c44aa3
+SELECT SHA2(CONCAT(
+    '2024-01-02 03:04:05',
+    CHAR(31 USING utf8mb4),
+    LOWER(TRIM(CONCAT(CHAR(9), ' Jalan Rusak ', CHAR(10), '  ')))
+), 256) AS content_hash_check;
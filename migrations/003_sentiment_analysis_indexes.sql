@@ -0,0 +1,10 @@
+-- Index komposit untuk query analitik yang memfilter rentang tanggal_keluhan
+-- (dashboard, daftar tahun, laporan) dan filter per aspek.
+-- Cek hasilnya dengan: python -m services.explain_check
+USE db_sentimen;
+
+ALTER TABLE sentiment_analysis
+    -- Rentang tanggal lalu GROUP BY aspek/sentimen; menutupi seluruh kolom query dashboard
+    ADD KEY idx_sentiment_analysis_tanggal (tanggal_keluhan, aspect_id, sentimen),
+    -- Filter aspek + rentang tanggal (juga memenuhi kebutuhan index foreign key aspect_id)
+    ADD KEY idx_sentiment_analysis_aspect_tanggal (aspect_id, tanggal_keluhan, sentimen);
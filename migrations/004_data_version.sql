@@ -0,0 +1,12 @@
+-- Versi data keluhan bersama untuk invalidasi cache di semua worker/proses.
+-- Dinaikkan dalam transaksi yang sama dengan insert (save_to_database,
+-- services.bulk_load) dan rebuild rollup term_frequency.
+USE db_sentimen;
+
+CREATE TABLE IF NOT EXISTS data_version (
+    id TINYINT UNSIGNED NOT NULL PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+);
+
+INSERT IGNORE INTO data_version (id, version) VALUES (1, 0);
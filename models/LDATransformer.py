@@ -1,13 +1,27 @@
 import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 
+# Probabilitas minimum yang dikembalikan gensim get_document_topics
+# (minimum_probability=0 dibulatkan ke nilai ini)
+MIN_TOPIC_PROBABILITY = 1e-8
+
 # Custom transformer untuk LDA
 class LDATransformer(BaseEstimator, TransformerMixin):
-    def __init__(self, lda_model, dictionary):
+    def __init__(self, lda_model, dictionary, batch_inference=True, dtype='float64'):
         if lda_model is None or dictionary is None:
             raise ValueError("lda_model and dictionary cannot be None")
         self.lda_model = lda_model
         self.dictionary = dictionary
+        self.batch_inference = batch_inference
+        self.dtype = dtype
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # Pipeline *.pkl lama disimpan sebelum opsi batch dan dtype ada
+        if 'batch_inference' not in self.__dict__:
+            self.batch_inference = True
+        if 'dtype' not in self.__dict__:
+            self.dtype = 'float64'
 
     def fit(self, X, y=None):
         return self
@@ -30,7 +44,12 @@ class LDATransformer(BaseEstimator, TransformerMixin):
                     valid_indices.append(i)
                     
             corpus = [self.dictionary.doc2bow(text) for text in valid_texts]
-            dense_vectors = np.zeros((len(texts), self.lda_model.num_topics))
+            dense_vectors = np.zeros((len(texts), self.lda_model.num_topics), dtype=self.dtype)
+
+            if self.batch_inference:
+                if corpus:
+                    dense_vectors[valid_indices] = self._infer_corpus(corpus)
+                return dense_vectors
 
             # Map results back to original indices
             for corpus_idx, doc_bow in enumerate(corpus):
@@ -41,4 +60,17 @@ class LDATransformer(BaseEstimator, TransformerMixin):
         except Exception as e:
             print(f"Error in LDATransformer.transform: {e}")
             # Return zero vectors as fallback
-            return np.zeros((len(X) if hasattr(X, '__len__') else 1, self.lda_model.num_topics))
\ No newline at end of file
+            return np.zeros((len(X) if hasattr(X, '__len__') else 1, self.lda_model.num_topics), dtype=self.dtype)
+
+    def _infer_corpus(self, corpus):
+        # Satu kali variational inference untuk seluruh corpus (per chunk
+        # sesuai chunksize model), setara dengan get_document_topics per dokumen
+        chunksize = getattr(self.lda_model, 'chunksize', None) or len(corpus)
+        gammas = [self.lda_model.inference(corpus[start:start + chunksize])[0]
+                  for start in range(0, len(corpus), chunksize)]
+        gamma = np.vstack(gammas)
+        topic_dist = gamma / gamma.sum(axis=1, keepdims=True)
+
+        # get_document_topics membuang topik dengan probabilitas < 1e-8
+        topic_dist[topic_dist < MIN_TOPIC_PROBABILITY] = 0
+        return topic_dist.astype(self.dtype, copy=False)
\ No newline at end of file
@@ -1,21 +1,97 @@
 import re
+import os
+import json
+import pickle
+import multiprocessing
+import threading
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import pandas as pd
 from nltk.corpus import stopwords
 from sklearn.base import BaseEstimator, TransformerMixin
 from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
 from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
 
+NORMALIZATION_DICT_PATH = os.path.join('static', 'assets', 'normalisasi-dictionary.csv')
+
 # Load the CSV file with error handling
 try:
-    normalization_dict = pd.read_csv('static/assets/normalisasi-dictionary.csv').set_index('takbaku')['baku'].to_dict()
+    normalization_dict = pd.read_csv(NORMALIZATION_DICT_PATH).set_index('takbaku')['baku'].to_dict()
 except (FileNotFoundError, pd.errors.EmptyDataError, KeyError) as e:
     print(f"Warning: Could not load normalization dictionary: {e}")
     normalization_dict = {}
 
+# Ukuran default cache kata -> hasil stemming
+DEFAULT_STEM_CACHE_SIZE = 50000
+
+# Pola regex dikompilasi sekali saat modul dimuat
+HTML_LINK_PATTERN = re.compile(r'<a\s+href="[^"]+"[^>]*>(.*?)<\/a>', flags=re.IGNORECASE)
+URL_PATTERN = re.compile(r'https:\/\/\S+')
+EMOJI_PATTERN = re.compile("["
+    u"\U0001F600-\U0001F64F"  # emoticons
+    u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+    u"\U0001F680-\U0001F6FF"  # transport & map symbols
+    u"\U0001F1E0-\U0001F1FF"  # flags
+    u"\U00002702-\U000027B0"
+    u"\U000024C2-\U0001F251"
+    "]+", flags=re.UNICODE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+NON_ALNUM_PATTERN = re.compile(r'[^a-zA-Z0-9\s]')
+SINGLE_CHAR_PATTERN = re.compile(r'\b[a-zA-Z]\b')
+DIGIT_WORD_PATTERN = re.compile(r'\b\w*\d\w*\b')
+
+# Ukuran default potongan dokumen per tugas pada process pool
+DEFAULT_CHUNK_SIZE = 500
+
+# Process pool persisten per konfigurasi preprocessor: {(konfigurasi, n_jobs): executor}
+_process_pools = {}
+_process_pools_lock = threading.Lock()
+
+# Worker tidak di-fork dari server yang multithread (thread job, batcher,
+# lock pool DB) karena lock yang sedang dipegang ikut tersalin dan bisa
+# membuat child deadlock
+_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Preprocessor milik proses worker, diisi sekali oleh initializer pool
+_worker_preprocessor = None
+
+def _init_worker(preprocessor_state):
+    global _worker_preprocessor
+    _worker_preprocessor = pickle.loads(preprocessor_state)
+    _worker_preprocessor.n_jobs = 1
+
+def _run_chunk(func, *args):
+    # Kembalikan juga kata yang baru di-stem serta hit/miss chunk ini agar
+    # cache stemming dan statistiknya di proses induk ikut terisi
+    preprocessor = _worker_preprocessor
+    hits, misses = preprocessor.stem_cache_hits, preprocessor.stem_cache_misses
+    preprocessor._stem_log = []
+    try:
+        results = func(*args)
+        return results, (preprocessor._stem_log,
+                         preprocessor.stem_cache_hits - hits, preprocessor.stem_cache_misses - misses)
+    finally:
+        preprocessor._stem_log = None
+
+def _preprocess_chunk(texts):
+    return _run_chunk(lambda: [_worker_preprocessor.preprocess_text(text) for text in texts])
+
+def _preprocess_pair_chunk(texts, stem):
+    return _run_chunk(lambda: [_worker_preprocessor.preprocess_pair(text, stem) for text in texts])
+
 class TextPreprocessor(BaseEstimator, TransformerMixin):
-    def __init__(self, do_stemming=True, do_tokens=True):
+    def __init__(self, do_stemming=True, do_tokens=True, stem_cache_size=DEFAULT_STEM_CACHE_SIZE, fused=True,
+                 n_jobs=1, chunk_size=DEFAULT_CHUNK_SIZE):
         self.do_stemming = do_stemming
         self.do_tokens = do_tokens
+        self.stem_cache_size = stem_cache_size
+        self.fused = fused
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self._token_table = None
+        self._reset_stem_cache()
         self.processed_data = None
         self.stemmer = StemmerFactory().create_stemmer()
         self.stopword_factory = StopWordRemoverFactory()
@@ -32,11 +108,115 @@ class TextPreprocessor(BaseEstimator, TransformerMixin):
         ]
         self.normalization_dict = normalization_dict
 
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # Pipeline *.pkl lama disimpan sebelum cache stemming ada
+        if 'stem_cache_size' not in self.__dict__:
+            self.stem_cache_size = DEFAULT_STEM_CACHE_SIZE
+        if '_stem_cache' not in self.__dict__:
+            self._reset_stem_cache()
+        self._stem_log = None
+        if 'fused' not in self.__dict__:
+            self.fused = True
+        if 'n_jobs' not in self.__dict__:
+            self.n_jobs = 1
+        if 'chunk_size' not in self.__dict__:
+            self.chunk_size = DEFAULT_CHUNK_SIZE
+        self._token_table = None
+
+    def __getstate__(self):
+        # Salin dulu: object.__getstate__ dapat mengembalikan __dict__ asli
+        state = dict(super().__getstate__())
+        # Tabel token dibangun ulang saat dibutuhkan, tidak perlu ikut di-pickle
+        state.pop('_token_table', None)
+        state.pop('_stem_log', None)
+        return state
+
+    def _reset_stem_cache(self):
+        self._stem_cache = OrderedDict()
+        self.stem_cache_hits = 0
+        self.stem_cache_misses = 0
+        # Diisi (kata, stem) hanya di worker pool selama satu chunk
+        self._stem_log = None
+
+    def _merge_stem_cache(self, entries, hits, misses):
+        """Gabungkan hasil stemming dan hit/miss dari worker pool ke cache ini."""
+        self.stem_cache_hits += hits
+        self.stem_cache_misses += misses
+        if not self.stem_cache_size:
+            return
+        cache = self._stem_cache
+        for word, stem in entries:
+            cache[word] = stem
+        while len(cache) > self.stem_cache_size:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                break
+
     def fit(self, X, y=None):
         return self
 
+    def _effective_n_jobs(self):
+        n_jobs = self.n_jobs or 1
+        if n_jobs < 0:
+            n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+        return n_jobs
+
+    def _pool_key(self, n_jobs):
+        # Pool dipakai bersama oleh preprocessor dengan konfigurasi sama;
+        # perubahan konfigurasi otomatis memakai pool (dan salinan) baru.
+        # Isi cache stemming tidak ikut karena hanya memoisasi: hasilnya sama
+        params = tuple(sorted((name, value) for name, value in self.get_params().items() if name != 'n_jobs'))
+        words = (frozenset(self.stopwords_en), frozenset(self.stopwords_id), frozenset(self.text_to_remove))
+        return (type(self).__qualname__, params, hash(words), n_jobs)
+
+    def _get_process_pool(self, n_jobs):
+        key = self._pool_key(n_jobs)
+        with _process_pools_lock:
+            pool = _process_pools.get(key)
+            if pool is None:
+                # Worker menerima salinan preprocessor (stemmer, kamus, stopword)
+                # sekali saat start, bukan per chunk
+                context = multiprocessing.get_context(_POOL_START_METHOD)
+                if _POOL_START_METHOD == 'forkserver':
+                    # Cukup modul ini; default-nya __main__ (app.py) ikut diimpor ulang
+                    context.set_forkserver_preload([__name__])
+                pool = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                           initargs=(pickle.dumps(self),), mp_context=context)
+                _process_pools[key] = pool
+        return pool, key
+
+    def _map_chunks(self, texts, serial_func, chunk_func, *args):
+        texts = list(texts)
+        n_jobs = self._effective_n_jobs()
+        chunk_size = max(1, int(self.chunk_size or DEFAULT_CHUNK_SIZE))
+
+        # Input kecil (mis. /process_text) tetap serial agar latensi tidak naik
+        if n_jobs <= 1 or len(texts) < 2 * chunk_size:
+            return [serial_func(text, *args) for text in texts]
+
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        pool, key = self._get_process_pool(n_jobs)
+        try:
+            results = list(pool.map(chunk_func, chunks, *[[arg] * len(chunks) for arg in args]))
+        except BrokenProcessPool as e:
+            print(f"Warning: preprocessing pool failed, falling back to serial: {e}")
+            with _process_pools_lock:
+                if _process_pools.get(key) is pool:
+                    del _process_pools[key]
+            return [serial_func(text, *args) for text in texts]
+
+        for _, stem_delta in results:
+            self._merge_stem_cache(*stem_delta)
+        return [item for chunk, _ in results for item in chunk]
+
+    def preprocess_pairs(self, X, stem=True):
+        """Kembalikan (teks bersih, teks hasil stemming) untuk setiap dokumen."""
+        return self._map_chunks(X, self.preprocess_pair, _preprocess_pair_chunk, stem)
+
     def transform(self, X):
-      processed = [self.preprocess_text(text) for text in X]
+      processed = self._map_chunks(X, self.preprocess_text, _preprocess_chunk)
       if self.do_tokens:
           self.processed_data = [text.split() for text in processed]  # Tokenisasi
       else:
@@ -46,9 +226,44 @@ class TextPreprocessor(BaseEstimator, TransformerMixin):
 
 
     def preprocess_text(self, text):
+        if self.fused:
+            if not isinstance(text, str):
+                return ""
+            tokens = self._filter_tokens(self._clean_fused(text).split())
+            if self.do_stemming:
+                tokens = [self._stem_word(word) for word in tokens]
+            return ' '.join(tokens)
+
+        text = self.clean_text(text)
+
+        # Stemming
+        if self.do_stemming:
+            text = self._stem_text(text)
+
+        return text
+
+    def preprocess_pair(self, text, stem=True):
+        if self.fused:
+            if not isinstance(text, str):
+                return "", ""
+            tokens = self._filter_tokens(self._clean_fused(text).split())
+            cleaned = ' '.join(tokens)
+            if not stem:
+                return cleaned, cleaned
+            return cleaned, ' '.join([self._stem_word(word) for word in tokens])
+
+        cleaned = self.clean_text(text)
+        return cleaned, (self._stem_text(cleaned) if stem else cleaned)
+
+    def clean_text(self, text):
+        # Seluruh tahap preprocessing kecuali stemming, agar hasilnya bisa
+        # dipakai bersama oleh pipeline yang melakukan stemming maupun tidak
         if not isinstance(text, str):
             return ""
 
+        if self.fused:
+            return ' '.join(self._filter_tokens(self._clean_fused(text).split()))
+
         # Casefolding
         text = text.lower()
 
@@ -66,39 +281,65 @@ class TextPreprocessor(BaseEstimator, TransformerMixin):
         text = self._remove_stopwords_id(text)
         text = self._remove_specific_words(text)
 
-        # Stemming
-        if self.do_stemming:
-            text = self._stem_text(text)
-
         return text
 
+    def _clean_fused(self, text):
+        # Tahap casefolding dan cleaning yang sama dengan jalur bertahap,
+        # memakai pola yang sudah dikompilasi
+        text = text.lower()
+        text = HTML_LINK_PATTERN.sub(r'\1', text)
+        text = URL_PATTERN.sub('', text)
+        text = EMOJI_PATTERN.sub('', text)
+        text = WHITESPACE_PATTERN.sub(' ', text.replace('<br>', ' ')).strip()
+        text = NON_ALNUM_PATTERN.sub(' ', text)
+        text = SINGLE_CHAR_PATTERN.sub(' ', text)
+        text = ' '.join(text.split())
+        return DIGIT_WORD_PATTERN.sub(' ', text)
+
+    def _build_token_table(self):
+        # Gabungan normalisasi + seluruh stopword dalam satu tabel:
+        # kata -> tuple kata keluaran (kosong berarti kata dibuang)
+        removed = frozenset(self.stopwords_en) | frozenset(self.stopwords_id) | frozenset(self.text_to_remove)
+        table = {word: () for word in removed}
+        for word, normalized in normalization_dict.items():
+            if isinstance(normalized, str):
+                table[word] = tuple(w for w in normalized.split() if w not in removed)
+        self._token_table = table
+        return table
+
+    def _filter_tokens(self, words):
+        table = self._token_table
+        if table is None:
+            table = self._build_token_table()
+
+        tokens = []
+        for word in words:
+            mapped = table.get(word)
+            if mapped is None:
+                tokens.append(word)
+            else:
+                tokens.extend(mapped)
+        return tokens
+
     def _remove_html(self, text):
-        text = re.sub(r'<a\s+href="[^"]+"[^>]*>(.*?)<\/a>', r'\1', text, flags=re.IGNORECASE)
-        text = re.sub(r'https:\/\/\S+', '', text)
+        text = HTML_LINK_PATTERN.sub(r'\1', text)
+        text = URL_PATTERN.sub('', text)
         return text
 
     def _remove_emoji(self, text):
-        emoji_pattern = re.compile("["
-            u"\U0001F600-\U0001F64F"  # emoticons
-            u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-            u"\U0001F680-\U0001F6FF"  # transport & map symbols
-            u"\U0001F1E0-\U0001F1FF"  # flags
-            u"\U00002702-\U000027B0"
-            u"\U000024C2-\U0001F251"
-            "]+", flags=re.UNICODE)
-        return emoji_pattern.sub(r'', text)
+        return EMOJI_PATTERN.sub(r'', text)
 
     def _clean_space(self, text):
         text = re.sub(r'<br>', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_PATTERN.sub(' ', text)
         return text.strip()
 
     def _complete_clean(self, text):
-        text = re.sub('[^a-zA-Z0-9\s]', ' ', text)
-        text = re.sub(r'\b[a-zA-Z]\b', ' ', text)
+        text = NON_ALNUM_PATTERN.sub(' ', text)
+        text = SINGLE_CHAR_PATTERN.sub(' ', text)
         text = ' '.join(text.split())
         text = re.sub("\n", " ", text)
-        text = re.sub(r'\b\w*\d\w*\b', ' ', text)
+        text = DIGIT_WORD_PATTERN.sub(' ', text)
         return text
 
     def _normalize_text(self, text):
@@ -114,4 +355,63 @@ class TextPreprocessor(BaseEstimator, TransformerMixin):
         return ' '.join([word for word in text.split() if word not in self.text_to_remove])
 
     def _stem_text(self, text):
-        return ' '.join([self.stemmer.stem(word) for word in text.split()])
\ No newline at end of file
+        return ' '.join([self._stem_word(word) for word in text.split()])
+
+    def _stem_word(self, word):
+        # Cache LRU terbatas: kata yang sama tidak perlu di-stem ulang
+        cache = self._stem_cache
+        stem = cache.get(word)
+        if stem is not None:
+            self.stem_cache_hits += 1
+            try:
+                cache.move_to_end(word)
+            except KeyError:
+                pass
+            return stem
+
+        self.stem_cache_misses += 1
+        stem = self.stemmer.stem(word)
+        if self._stem_log is not None:
+            self._stem_log.append((word, stem))
+        if self.stem_cache_size:
+            cache[word] = stem
+            while len(cache) > self.stem_cache_size:
+                try:
+                    cache.popitem(last=False)
+                except KeyError:
+                    break
+        return stem
+
+    def stem_cache_info(self):
+        hits, misses = self.stem_cache_hits, self.stem_cache_misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'size': len(self._stem_cache),
+            'maxsize': self.stem_cache_size
+        }
+
+    def load_stem_cache(self, path):
+        """Isi cache stemming dari file JSON {kata: stem} hasil save_stem_cache."""
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        for word, stem in entries.items():
+            if self.stem_cache_size and len(self._stem_cache) >= self.stem_cache_size:
+                break
+            self._stem_cache[word] = stem
+        return len(self._stem_cache)
+
+    def save_stem_cache(self, path):
+        # Tulis ke file sementara milik proses ini dulu agar file lama tidak
+        # rusak jika gagal dan worker lain yang menyimpan bersamaan tidak
+        # menimpa file sementara yang sama
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                        dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(dict(self._stem_cache), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+# Urutan kategori sentimen; skor dipakai untuk rata-rata sentimen per aspek
+SENTIMENTS = ('negatif', 'netral')
+SENTIMENT_SCORES = {'negatif': -1, 'netral': 0}
+
+
+class _Categories:
+    """Pemetaan label -> kode integer yang bisa bertambah antar batch."""
+
+    def __init__(self, labels=(), grow=True, normalize=None):
+        self.labels = list(labels)
+        self.index = {label: code for code, label in enumerate(self.labels)}
+        self.grow = grow
+        self.normalize = normalize
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _code(self, label):
+        if self.normalize is not None:
+            label = self.normalize(label)
+        code = self.index.get(label)
+        if code is None and self.grow:
+            code = self.index[label] = len(self.labels)
+            self.labels.append(label)
+        return -1 if code is None else code
+
+    def encode(self, values):
+        """Kode per nilai (-1 untuk kosong/tidak dikenal).
+
+        ``pd.factorize`` bekerja sekali atas seluruh array; lookup dict hanya
+        dilakukan per nilai unik, bukan per baris.
+        """
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        # Indeks -1 dari factorize (NaN/None) jatuh ke elemen terakhir = -1
+        mapping = np.fromiter((self._code(label) for label in uniques), dtype=np.int64, count=len(uniques))
+        return np.append(mapping, -1)[codes]
+
+
+def _normalize_sentiment(label):
+    return str(label).strip().lower()
+
+
+def _grow(matrix, shape):
+    if matrix.shape == shape:
+        return matrix
+    grown = np.zeros(shape, dtype=np.int64)
+    grown[:matrix.shape[0], :matrix.shape[1]] = matrix
+    return grown
+
+
+def _bincount_2d(rows, cols, shape, weights=None):
+    valid = (rows >= 0) & (cols >= 0)
+    flat = rows[valid] * shape[1] + cols[valid]
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)[valid]
+    counts = np.bincount(flat, weights=weights, minlength=shape[0] * shape[1])
+    return np.rint(counts).astype(np.int64).reshape(shape)
+
+
+class CategoricalCounter:
+    """Akumulasi matriks jumlah aspek x sentimen dan bulan x aspek.
+
+    Label diubah menjadi kode kategori lalu dihitung dengan satu
+    ``np.bincount`` per batch. Input bisa berupa baris mentah (satu baris =
+    satu keluhan) atau hasil GROUP BY dengan ``weights`` berisi jumlahnya.
+    """
+
+    def __init__(self, sentiments=SENTIMENTS):
+        self.aspects = _Categories()
+        self.sentiments = _Categories(sentiments, grow=False, normalize=_normalize_sentiment)
+        self.months = _Categories()
+        self._sentiment_matrix = np.zeros((0, len(self.sentiments)), dtype=np.int64)
+        self._monthly_matrix = np.zeros((0, 0), dtype=np.int64)
+
+    def add(self, aspects, sentiments, weights=None):
+        aspect_codes = self.aspects.encode(aspects)
+        sentiment_codes = self.sentiments.encode(sentiments)
+        shape = (len(self.aspects), len(self.sentiments))
+        self._sentiment_matrix = _grow(self._sentiment_matrix, shape)
+        self._sentiment_matrix += _bincount_2d(aspect_codes, sentiment_codes, shape, weights)
+        return self
+
+    def add_monthly(self, months, aspects, weights=None):
+        month_codes = self.months.encode(months)
+        aspect_codes = self.aspects.encode(aspects)
+        shape = (len(self.months), len(self.aspects))
+        self._monthly_matrix = _grow(self._monthly_matrix, shape)
+        self._monthly_matrix += _bincount_2d(month_codes, aspect_codes, shape, weights)
+        return self
+
+    def summary(self):
+        """Ringkasan dengan aspek dan bulan terurut; aspek tanpa data dibuang."""
+        n_aspects = len(self.aspects)
+        sentiment_matrix = _grow(self._sentiment_matrix, (n_aspects, len(self.sentiments)))
+        monthly_matrix = _grow(self._monthly_matrix, (len(self.months), n_aspects))
+
+        aspect_labels = np.array([str(label) for label in self.aspects.labels], dtype=object)
+        used = (sentiment_matrix.sum(axis=1) > 0) | (monthly_matrix.sum(axis=0) > 0)
+        aspect_order = np.flatnonzero(used)[np.argsort(aspect_labels[used], kind='stable')]
+
+        month_labels = np.array([str(label) for label in self.months.labels], dtype=object)
+        month_order = np.argsort(month_labels, kind='stable')
+
+        return CountSummary(
+            aspects=aspect_labels[aspect_order],
+            sentiments=tuple(self.sentiments.labels),
+            matrix=sentiment_matrix[aspect_order],
+            months=month_labels[month_order],
+            monthly=monthly_matrix[month_order][:, aspect_order]
+        )
+
+
+class CountSummary:
+    """Matriks jumlah hasil ``CategoricalCounter`` dan turunannya.
+
+    ``matrix[i, j]`` = jumlah keluhan aspek ``aspects[i]`` bersentimen
+    ``sentiments[j]``; ``monthly[m, i]`` = jumlah keluhan aspek ``aspects[i]``
+    pada bulan ``months[m]``.
+    """
+
+    def __init__(self, aspects, sentiments, matrix, months, monthly):
+        self.aspects = aspects
+        self.sentiments = sentiments
+        self.matrix = matrix
+        self.months = months
+        self.monthly = monthly
+
+    @property
+    def aspect_totals(self):
+        return self.matrix.sum(axis=1)
+
+    @property
+    def sentiment_totals(self):
+        return self.matrix.sum(axis=0)
+
+    @property
+    def total(self):
+        return int(self.matrix.sum())
+
+    def count(self, sentiment):
+        return int(self.sentiment_totals[self.sentiments.index(sentiment)])
+
+    def percentages(self):
+        """Persentase tiap sentimen per aspek (dibulatkan 2 desimal)."""
+        totals = self.aspect_totals[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = np.where(totals > 0, self.matrix / totals * 100, 0.0)
+        return shares.round(2)
+
+    def sentiment_percentages(self):
+        """Persentase tiap sentimen terhadap seluruh keluhan."""
+        total = self.total
+        return self.sentiment_totals / total * 100 if total else np.zeros(len(self.sentiments))
+
+    def mean_scores(self):
+        """Rata-rata skor sentimen per aspek, tertimbang jumlah keluhan."""
+        scores = np.array([SENTIMENT_SCORES.get(label, 0) for label in self.sentiments], dtype=np.float64)
+        totals = self.aspect_totals
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(totals > 0, self.matrix @ scores / totals, 0.0)
+
+
+def summarize_counts(sentiment_counts, monthly_counts=None):
+    """Ringkasan dari hasil query agregat dashboard/laporan.
+
+    ``sentiment_counts`` berkolom ``aspect``, ``sentimen``, ``jumlah`` dan
+    ``monthly_counts`` berkolom ``month``, ``aspect``, ``jumlah``.
+    """
+    counter = CategoricalCounter()
+    counter.add(sentiment_counts['aspect'], sentiment_counts['sentimen'], weights=sentiment_counts['jumlah'])
+    if monthly_counts is not None:
+        counter.add_monthly(monthly_counts['month'], monthly_counts['aspect'], weights=monthly_counts['jumlah'])
+    return counter.summary()
+
+
+def summarize_batches(batches, aspect_key='topik', sentiment_key='sentimen'):
+    """Ringkasan dari baris mentah per batch (mis. ``ResultStore.iter_batches``)."""
+    counter = CategoricalCounter()
+    for batch in batches:
+        counter.add([row[aspect_key] for row in batch], [row[sentiment_key] for row in batch])
+    return counter.summary()
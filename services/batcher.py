@@ -0,0 +1,118 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """Gabungkan permintaan prediksi yang datang bersamaan menjadi satu batch.
+
+    ``func(items)`` menerima list item dan mengembalikan list hasil dengan
+    urutan yang sama. Setiap ``submit`` menunggu sampai batch yang memuat
+    item-itemnya selesai. Batch dikirim saat berisi ``max_batch_size`` item
+    atau ``max_wait`` detik setelah item pertama masuk; permintaan yang lebih
+    besar dari ``max_batch_size`` dipecah sehingga batch tidak pernah
+    melebihi batas tersebut.
+    """
+
+    def __init__(self, func, max_batch_size=64, max_wait=0.01):
+        self.func = func
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+
+        self._queue = queue.Queue()
+        # Entry yang tidak muat di batch sebelumnya; hanya dipakai thread worker
+        self._carry = None
+        self._lock = threading.Lock()
+        self._worker = None
+        self._pid = None
+        self._batches = 0
+        self._items = 0
+        self._max_seen = 0
+
+    def submit(self, items):
+        """Prediksi ``items`` (list) dan kembalikan list hasilnya."""
+        items = list(items)
+        if not items:
+            return []
+        self._ensure_worker()
+        futures = []
+        for start in range(0, len(items), self.max_batch_size):
+            future = Future()
+            self._queue.put((items[start:start + self.max_batch_size], future))
+            futures.append(future)
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _ensure_worker(self):
+        # Thread dibuat saat dipakai pertama kali di setiap proses (aman setelah fork)
+        if self._worker is not None and self._pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or self._pid != os.getpid() or not self._worker.is_alive():
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                    self._carry = None
+                self._pid = os.getpid()
+                self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                self._worker.start()
+
+    def _collect(self):
+        if self._carry is not None:
+            pending = [self._carry]
+            self._carry = None
+        else:
+            pending = [self._queue.get()]
+        size = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if size + len(entry[0]) > self.max_batch_size:
+                # Tidak muat: menjadi awal batch berikutnya
+                self._carry = entry
+                break
+            pending.append(entry)
+            size += len(entry[0])
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            items = [item for entry_items, _ in pending for item in entry_items]
+            try:
+                results = self.func(items)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            with self._lock:
+                self._batches += 1
+                self._items += len(items)
+                self._max_seen = max(self._max_seen, len(items))
+
+            offset = 0
+            for entry_items, future in pending:
+                future.set_result(results[offset:offset + len(entry_items)])
+                offset += len(entry_items)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+                'batches': self._batches,
+                'items': self._items,
+                'avg_batch_size': self._items / self._batches if self._batches else 0.0,
+                'max_batch_seen': self._max_seen,
+                'queued': self._queue.qsize()
+            }
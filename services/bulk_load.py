@@ -0,0 +1,246 @@
+import argparse
+import ast
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from services.aggregation import SENTIMENTS
+from services.dedup import filter_new_rows, insert_new_rows, insert_rows_one_by_one
+from services.ingest import iter_upload_chunks, UploadFormatError
+from services.cache import data_version
+from services.term_frequency import count_terms, upsert_term_frequencies
+
+# Kolom tambahan (selain keluhan dan tanggal_keluhan) yang wajib ada di file historis
+LOAD_COLUMNS = ['preprocessed_text', 'sentimen', 'aspect_id']
+
+DEFAULT_CHUNK_SIZE = 5000
+
+LOAD_DATA_QUERY = """
+    LOAD DATA LOCAL INFILE %s
+    IGNORE INTO TABLE sentiment_analysis
+    CHARACTER SET utf8mb4
+    FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+    LINES TERMINATED BY '\\n'
+    (sentimen, tanggal_keluhan, keluhan, preprocessed_text, aspect_id, content_hash)
+"""
+
+
+def parse_preprocessed(value):
+    """Ubah sel preprocessed_text menjadi string JSON.
+
+    json.loads dicoba lebih dulu karena jauh lebih cepat; ast.literal_eval
+    hanya dipakai untuk format list Python (mis. ``['a', 'b']``).
+    """
+    if not isinstance(value, str):
+        if value is None or value != value:
+            return json.dumps([])
+        return json.dumps(value)
+    try:
+        json.loads(value)
+        return value
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.dumps(ast.literal_eval(value))
+    except (ValueError, SyntaxError) as e:
+        print(f"Warning: Could not convert preprocessed_text: {e}")
+        return json.dumps(value)
+
+
+def _is_blank(value):
+    # Sel kosong dari pandas berupa NaN (float) atau None
+    return value is None or value != value or not str(value).strip()
+
+
+def prepare_rows(chunk):
+    """Ubah satu chunk DataFrame menjadi tuple untuk sentiment_analysis.
+
+    Baris dengan ``keluhan`` atau ``tanggal_keluhan`` kosong, atau
+    ``sentimen`` di luar ``SENTIMENTS``, dibuang. Mengembalikan
+    ``(rows, rejected)``.
+    """
+    missing = [column for column in LOAD_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise UploadFormatError(f"Missing required columns: {missing}")
+
+    tanggal = pd.to_datetime(chunk['tanggal_keluhan']).dt.strftime('%Y-%m-%d %H:%M:%S').tolist()
+    aspect_ids = [None if value is None or value != value else int(value) for value in chunk['aspect_id']]
+    rows = []
+    rejected = 0
+    for offset, (keluhan, preprocessed, sentimen) in enumerate(
+            zip(chunk['keluhan'].tolist(), chunk['preprocessed_text'].tolist(), chunk['sentimen'].tolist())):
+        sentimen = None if _is_blank(sentimen) else str(sentimen).strip().lower()
+        if _is_blank(keluhan) or _is_blank(tanggal[offset]) or sentimen not in SENTIMENTS:
+            rejected += 1
+            continue
+        rows.append((sentimen, tanggal[offset], str(keluhan), parse_preprocessed(preprocessed), aspect_ids[offset]))
+    return rows, rejected
+
+
+def _tsv_field(value):
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def load_data_infile(cursor, rows):
+    """Insert baris (sudah berisi content_hash) lewat LOAD DATA LOCAL INFILE."""
+    fd, path = tempfile.mkstemp(prefix='bulk_load_', suffix='.tsv')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            for row in rows:
+                f.write('\t'.join(_tsv_field(value) for value in row))
+                f.write('\n')
+        cursor.execute(LOAD_DATA_QUERY, (path,))
+        return cursor.rowcount
+    finally:
+        os.remove(path)
+
+
+class Checkpoint:
+    """Catat jumlah baris yang sudah di-commit agar load bisa dilanjutkan."""
+
+    def __init__(self, path, source):
+        self.path = path
+        stat = os.stat(source)
+        # File sumber yang berubah membuat checkpoint lama tidak berlaku
+        self.source = {'path': os.path.abspath(source), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0
+        if state.get('source') != self.source:
+            return 0
+        return int(state.get('rows_done', 0))
+
+    def save(self, rows_done):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'source': self.source, 'rows_done': rows_done}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def bulk_load(connection, path, chunk_size=DEFAULT_CHUNK_SIZE, use_load_data=False,
+              checkpoint_path=None, resume=True):
+    """Muat file CSV/XLSX historis ke sentiment_analysis per chunk.
+
+    Setiap chunk di-commit bersama rollup term_frequency-nya lalu
+    checkpoint diperbarui, sehingga load yang terputus dapat dilanjutkan
+    dari chunk terakhir. Mengembalikan ``(inserted, skipped, rejected)``;
+    ``rejected`` adalah baris tidak valid yang dibuang ``prepare_rows``.
+    """
+    checkpoint = Checkpoint(checkpoint_path or f"{path}.checkpoint.json", path)
+    rows_done = checkpoint.load() if resume else 0
+    if rows_done:
+        print(f"Resuming {path} from row {rows_done}")
+
+    inserted = 0
+    skipped = 0
+    rejected = 0
+    rows_seen = 0
+    start_time = time.perf_counter()
+    cursor = connection.cursor()
+    try:
+        with open(path, 'rb') as file:
+            for chunk in iter_upload_chunks(file, path, chunk_size):
+                chunk_start = rows_seen
+                rows_seen += len(chunk)
+                if rows_seen <= rows_done:
+                    continue
+                if chunk_start < rows_done:
+                    chunk = chunk.iloc[rows_done - chunk_start:]
+
+                rows, chunk_rejected = prepare_rows(chunk)
+                if use_load_data:
+                    new_rows = filter_new_rows(cursor, rows)
+                    if new_rows:
+                        cursor.execute("SAVEPOINT bulk_load_chunk")
+                        if load_data_infile(cursor, new_rows) < len(new_rows):
+                            # Sebagian baris dimasukkan proses lain setelah pengecekan;
+                            # ulangi per baris agar rollup hanya memuat baris yang masuk
+                            cursor.execute("ROLLBACK TO SAVEPOINT bulk_load_chunk")
+                            new_rows = insert_rows_one_by_one(cursor, new_rows)
+                    chunk_inserted = len(new_rows)
+                    new_rows = [row[:5] for row in new_rows]
+                else:
+                    new_rows, chunk_skipped = insert_new_rows(cursor, rows)
+                    chunk_inserted = len(rows) - chunk_skipped
+
+                if new_rows:
+                    upsert_term_frequencies(cursor, count_terms(
+                        (row[1], row[4], row[0], row[3]) for row in new_rows
+                    ))
+                if chunk_inserted:
+                    # Cache dashboard/word cloud/laporan di aplikasi ikut kedaluwarsa
+                    data_version.bump(cursor)
+                connection.commit()
+                checkpoint.save(rows_seen)
+
+                inserted += chunk_inserted
+                skipped += len(rows) - chunk_inserted
+                rejected += chunk_rejected
+                elapsed = time.perf_counter() - start_time
+                loaded = rows_seen - rows_done
+                print(f"{rows_seen} rows processed ({inserted} inserted, {skipped} skipped, "
+                      f"{rejected} rejected, {loaded / elapsed:.1f} rows/sec)")
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    checkpoint.clear()
+    return inserted, skipped, rejected
+
+
+def main(argv=None):
+    import mysql.connector
+    from config.database import config
+
+    parser = argparse.ArgumentParser(description="Muat data keluhan historis (CSV/XLSX) ke sentiment_analysis")
+    parser.add_argument('path', help="file CSV/XLSX dengan kolom tanggal_keluhan, keluhan, "
+                                     "preprocessed_text, sentimen, aspect_id")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--load-data', action='store_true',
+                        help="gunakan LOAD DATA LOCAL INFILE (local_infile harus aktif di server)")
+    parser.add_argument('--checkpoint', help="file checkpoint (default: <path>.checkpoint.json)")
+    parser.add_argument('--restart', action='store_true', help="abaikan checkpoint dan mulai dari awal")
+    args = parser.parse_args(argv)
+
+    try:
+        connection = mysql.connector.connect(**config, allow_local_infile=args.load_data)
+    except mysql.connector.Error as error:
+        print(f'Failed to connect to MySQL database: {error}')
+        raise SystemExit(1)
+
+    start_time = time.perf_counter()
+    try:
+        inserted, skipped, rejected = bulk_load(connection, args.path, chunk_size=args.chunk_size,
+                                      use_load_data=args.load_data, checkpoint_path=args.checkpoint,
+                                      resume=not args.restart)
+    except UploadFormatError as e:
+        print(f"Error reading file: {e}")
+        raise SystemExit(1)
+    finally:
+        connection.close()
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Bulk load selesai dalam {elapsed:.1f}s: {inserted} baris ditambahkan, {skipped} duplikat dilewati, "
+          f"{rejected} baris tidak valid (keluhan/tanggal kosong atau sentimen tidak dikenal) dibuang.")
+
+
+if __name__ == '__main__':
+    main()
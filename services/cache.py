@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Cache LRU berukuran terbatas dengan masa berlaku (TTL) per entri."""
+
+    def __init__(self, maxsize=128, ttl=600):
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+# Versi data disimpan di satu baris tabel data_version (migrations/004) agar
+# semua worker gunicorn dan CLI (bulk_load, rebuild rollup) berbagi nilai yang sama
+DATA_VERSION_QUERY = "SELECT version, UNIX_TIMESTAMP(updated_at) FROM data_version WHERE id = 1"
+BUMP_DATA_VERSION_QUERY = """
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP(6) WHERE id = 1
+"""
+
+
+class DataVersion:
+    """Versi data keluhan; naik setiap kali data keluhan berubah.
+
+    Dipakai sebagai bagian dari key cache sehingga entri lama otomatis
+    tidak terpakai lagi setelah ada insert baru. Nilainya dibaca dari
+    tabel ``data_version`` paling sering sekali per ``check_interval``
+    detik, jadi perubahan dari worker lain terlihat dalam selang itu.
+    """
+
+    def __init__(self, check_interval=2.0):
+        self.check_interval = check_interval
+        self._value = 0
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self.updated_at = time.time()
+
+    @property
+    def value(self):
+        """Versi terakhir yang dibaca (tanpa query)."""
+        return self._value
+
+    def refresh(self, connection):
+        """Versi terbaru dari database, memakai hasil baca yang masih segar."""
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return self._value
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute(DATA_VERSION_QUERY)
+            row = cursor.fetchone()
+            value, updated_at = (int(row[0]), float(row[1])) if row else (self._value, self.updated_at)
+        except Exception as e:
+            # Mis. migrations/004 belum dijalankan: pakai versi terakhir
+            print(f"Warning: Could not read data version: {e}")
+            return self._value
+        finally:
+            cursor.close()
+
+        with self._lock:
+            self._value = value
+            self.updated_at = updated_at
+            self._checked_at = now
+            return self._value
+
+    def bump(self, cursor):
+        """Naikkan versi dalam transaksi pemanggil (sebelum commit).
+
+        Setelah commit panggil ``invalidate()`` agar proses ini langsung
+        membaca versi baru.
+        """
+        cursor.execute(BUMP_DATA_VERSION_QUERY)
+
+    def invalidate(self):
+        with self._lock:
+            self._checked_at = None
+
+
+# Versi data keluhan untuk proses ini
+data_version = DataVersion(check_interval=float(os.getenv('DATA_VERSION_CHECK_INTERVAL', '2')))
@@ -0,0 +1,98 @@
+import base64
+import hashlib
+import json
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson opsional, fallback ke json standar
+    orjson = None
+
+# Tipe integer terkecil dulu; plotly.js >= 2.28 membaca array bertipe
+# sebagai {"dtype": ..., "bdata": base64} tanpa parsing angka satu per satu
+INT_DTYPES = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4')
+
+
+def _typed_array(array):
+    """Array numerik numpy sebagai typed array base64 ala plotly.js."""
+    if array.dtype.kind in 'iu':
+        low, high = (int(array.min()), int(array.max())) if array.size else (0, 0)
+        for dtype in INT_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                break
+        else:
+            # Di luar int32: tetap sebagai daftar angka biasa
+            return array.tolist()
+    elif array.size and np.all(np.isfinite(array)) and np.all(array == np.round(array)) \
+            and np.abs(array).max() <= np.iinfo('u4').max:
+        # Float berisi bilangan bulat (mis. jumlah dari bincount berbobot): perlakukan sebagai integer
+        return _typed_array(array.astype(np.int64))
+    else:
+        # Float non-integer (persentase, skor) tetap float64 agar nilainya tidak berubah
+        dtype = 'f8'
+    encoded = {'dtype': dtype, 'bdata': base64.b64encode(array.astype(dtype).tobytes()).decode('ascii')}
+    if array.ndim > 1:
+        encoded['shape'] = ','.join(str(size) for size in array.shape)
+    return encoded
+
+
+def _compact(value):
+    """Ubah isi figure menjadi tipe JSON biasa; array numerik jadi typed array."""
+    if isinstance(value, dict):
+        return {key: _compact(item) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return [_compact(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in 'iuf':
+            return _typed_array(value)
+        return [_compact(item) for item in value.tolist()]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def dumps(value):
+    """Serialisasi JSON ringkas (tanpa spasi) sebagai bytes."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _prune_template(template, trace_types):
+    """Buang default trace yang tidak dipakai (contour, surface, dll.) dari template."""
+    template = dict(template)
+    if 'data' in template:
+        template['data'] = {kind: value for kind, value in template['data'].items() if kind in trace_types}
+    return template
+
+
+def compact_charts(figures):
+    """Payload JSON ringkas untuk beberapa figure Plotly.
+
+    ``figures`` berupa dict ``{id elemen: figure}``. Template layout (bagian
+    terbesar dari setiap figure) dipangkas ke jenis trace yang dipakai lalu
+    disimpan sekali di ``templates``; setiap chart hanya menyimpan id-nya.
+    """
+    specs = {name: figure.to_plotly_json() for name, figure in figures.items()}
+    trace_types = {trace.get('type', 'scatter') for spec in specs.values() for trace in spec.get('data') or []}
+
+    templates = {}
+    charts = {}
+    for name, spec in specs.items():
+        layout = dict(spec.get('layout') or {})
+        chart = {'data': _compact(spec.get('data') or [])}
+
+        template = layout.pop('template', None)
+        if template:
+            template = _compact(_prune_template(template, trace_types))
+            template_id = hashlib.sha1(dumps(template)).hexdigest()[:8]
+            templates.setdefault(template_id, template)
+            chart['template'] = template_id
+
+        chart['layout'] = _compact(layout)
+        charts[name] = chart
+    return dumps({'templates': templates, 'charts': charts})
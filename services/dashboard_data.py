@@ -0,0 +1,157 @@
+from datetime import datetime
+
+import pandas as pd
+
+from services.metrics import timed
+
+# Filter tanggal berupa rentang setengah terbuka [awal, akhir) agar index
+# pada tanggal_keluhan dapat dipakai (YEAR(kolom) = ... selalu full scan).
+SENTIMENT_COUNTS_QUERY = """
+    SELECT
+        a.aspect,
+        sa.sentimen,
+        COUNT(*) AS jumlah
+    FROM
+        sentiment_analysis sa
+    JOIN
+        aspect a
+    ON
+        sa.aspect_id = a.aspect_id
+    WHERE
+        sa.tanggal_keluhan >= %s AND sa.tanggal_keluhan < %s
+    GROUP BY
+        a.aspect, sa.sentimen
+"""
+
+MONTHLY_COUNTS_QUERY = """
+    SELECT
+        MONTH(sa.tanggal_keluhan) AS bulan,
+        a.aspect,
+        COUNT(*) AS jumlah
+    FROM
+        sentiment_analysis sa
+    JOIN
+        aspect a
+    ON
+        sa.aspect_id = a.aspect_id
+    WHERE
+        sa.tanggal_keluhan >= %s AND sa.tanggal_keluhan < %s
+    GROUP BY
+        bulan, a.aspect
+"""
+
+ASPECT_NAME_QUERY = "SELECT aspect FROM aspect WHERE aspect_id = %s"
+
+# MIN/MAX pada kolom ber-index dibaca langsung dari ujung index
+YEAR_BOUNDS_QUERY = "SELECT MIN(tanggal_keluhan), MAX(tanggal_keluhan) FROM sentiment_analysis"
+
+YEAR_PROBE_QUERY = """
+    SELECT 1 FROM sentiment_analysis
+    WHERE tanggal_keluhan >= %s AND tanggal_keluhan < %s
+    LIMIT 1
+"""
+
+
+def year_range(year):
+    """Rentang ``[1 Jan year, 1 Jan year+1)`` untuk filter per tahun."""
+    year = int(year)
+    return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+
+
+def _fetch_frame(connection, query, params, columns):
+    cursor = connection.cursor(dictionary=True)
+    try:
+        with timed('db_query'):
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    return pd.DataFrame(rows, columns=columns)
+
+
+def fetch_sentiment_counts(connection, year):
+    """Jumlah keluhan per aspek x sentimen dalam satu tahun.
+
+    Kolom hasil: ``aspect``, ``sentimen``, ``jumlah``.
+    """
+    counts = _fetch_frame(connection, SENTIMENT_COUNTS_QUERY, year_range(year), ['aspect', 'sentimen', 'jumlah'])
+    counts['jumlah'] = counts['jumlah'].astype('int64')
+    return counts
+
+
+def fetch_monthly_counts(connection, year):
+    """Jumlah keluhan per bulan x aspek dalam satu tahun.
+
+    Kolom hasil: ``month`` (format ``YYYY-MM``), ``aspect``, ``jumlah``.
+    """
+    counts = _fetch_frame(connection, MONTHLY_COUNTS_QUERY, year_range(year), ['bulan', 'aspect', 'jumlah'])
+    counts['month'] = [f"{int(year)}-{int(bulan):02d}" for bulan in counts['bulan']]
+    counts['jumlah'] = counts['jumlah'].astype('int64')
+    return counts[['month', 'aspect', 'jumlah']]
+
+
+def report_counts_query(start, end, aspect_id='all'):
+    """Query aspek x sentimen untuk rentang ``[start, end)`` beserta parameternya.
+
+    Dengan filter aspek, index ``(aspect_id, tanggal_keluhan, sentimen)``
+    dipakai sehingga hanya baris aspek tersebut yang dibaca.
+    """
+    query = """
+        SELECT a.aspect, sa.sentimen, COUNT(*) AS jumlah
+        FROM sentiment_analysis sa
+        JOIN aspect a ON sa.aspect_id = a.aspect_id
+        WHERE sa.tanggal_keluhan >= %s AND sa.tanggal_keluhan < %s
+    """
+    params = [start, end]
+    if aspect_id != 'all':
+        query += " AND sa.aspect_id = %s"
+        params.append(int(aspect_id))
+    query += " GROUP BY a.aspect, sa.sentimen"
+    return query, params
+
+
+def fetch_report_counts(connection, start, end, aspect_id='all'):
+    """Jumlah keluhan per aspek x sentimen untuk rentang tanggal ``[start, end)``.
+
+    Kolom hasil sama dengan ``fetch_sentiment_counts``.
+    """
+    query, params = report_counts_query(start, end, aspect_id)
+    counts = _fetch_frame(connection, query, params, ['aspect', 'sentimen', 'jumlah'])
+    counts['jumlah'] = counts['jumlah'].astype('int64')
+    return counts
+
+
+def fetch_aspect_name(connection, aspect_id):
+    """Nama aspek untuk ``aspect_id``, atau None bila tidak ada."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(ASPECT_NAME_QUERY, (int(aspect_id),))
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    return row[0] if row else None
+
+
+def fetch_available_years(connection):
+    """Daftar tahun yang memiliki data, sebagai ``[{'year': ...}]`` terurut.
+
+    Tahun pertama dan terakhir diambil dari MIN/MAX, lalu setiap tahun di
+    antaranya dicek dengan satu probe index ``LIMIT 1``; tidak ada scan
+    seluruh tabel seperti ``SELECT DISTINCT YEAR(...)``.
+    """
+    cursor = connection.cursor()
+    try:
+        with timed('db_query'):
+            cursor.execute(YEAR_BOUNDS_QUERY)
+            first, last = cursor.fetchone()
+            if first is None:
+                return []
+
+            years = []
+            for year in range(first.year, last.year + 1):
+                cursor.execute(YEAR_PROBE_QUERY, year_range(year))
+                if cursor.fetchall():
+                    years.append({'year': year})
+            return years
+    finally:
+        cursor.close()
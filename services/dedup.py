@@ -0,0 +1,96 @@
+import hashlib
+
+import mysql.connector
+from mysql.connector import errorcode
+
+INSERT_QUERY = """
+    INSERT INTO sentiment_analysis
+    (sentimen, tanggal_keluhan, keluhan, preprocessed_text, aspect_id, content_hash)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+# Baris yang content_hash-nya sudah ada dilewati oleh unique index
+INSERT_IGNORE_QUERY = """
+    INSERT IGNORE INTO sentiment_analysis
+    (sentimen, tanggal_keluhan, keluhan, preprocessed_text, aspect_id, content_hash)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+
+def normalize_keluhan(keluhan):
+    # TRIM() MySQL hanya membuang spasi, bukan tab/newline seperti str.strip()
+    return str(keluhan or '').strip(' ').lower()
+
+
+def content_hash(tanggal, keluhan):
+    """SHA-256 dari pasangan (tanggal, keluhan) yang dinormalisasi.
+
+    Harus sama dengan ekspresi backfill di migrations/002_content_hash.sql:
+    ``SHA2(CONCAT(DATE_FORMAT(tanggal, '%Y-%m-%d %H:%i:%s'), CHAR(31), LOWER(TRIM(keluhan))), 256)``.
+    """
+    if not isinstance(tanggal, str):
+        tanggal = tanggal.strftime('%Y-%m-%d %H:%M:%S')
+    value = f"{tanggal[:19]}\x1f{normalize_keluhan(keluhan)}"
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def existing_hashes(cursor, hashes):
+    """content_hash yang sudah ada di tabel (lookup lewat unique index)."""
+    hashes = list(hashes)
+    if not hashes:
+        return set()
+    placeholders = ', '.join(['%s'] * len(hashes))
+    cursor.execute(
+        f"SELECT content_hash FROM sentiment_analysis WHERE content_hash IN ({placeholders})",
+        hashes
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def filter_new_rows(cursor, rows):
+    """Buang duplikat di dalam batch dan baris yang sudah ada di database.
+
+    ``rows`` berisi tuple ``(sentimen, tanggal_keluhan, keluhan,
+    preprocessed_text, aspect_id)``; hasilnya ditambah ``content_hash``.
+    """
+    batch = {}
+    for row in rows:
+        batch.setdefault(content_hash(row[1], row[2]), row)
+
+    existing = existing_hashes(cursor, batch)
+    return [row + (row_hash,) for row_hash, row in batch.items() if row_hash not in existing]
+
+
+def insert_rows_one_by_one(cursor, rows):
+    """INSERT IGNORE per baris; hanya baris yang benar-benar masuk yang dikembalikan."""
+    inserted = []
+    for row in rows:
+        cursor.execute(INSERT_IGNORE_QUERY, row)
+        if cursor.rowcount:
+            inserted.append(row)
+    return inserted
+
+
+def insert_new_rows(cursor, rows):
+    """Insert satu batch tanpa duplikat (tanpa commit).
+
+    Mengembalikan ``(new_rows, skipped)``; ``new_rows`` (tanpa hash) hanya
+    berisi baris yang benar-benar ditambahkan dan dipakai pemanggil untuk
+    memperbarui rollup term_frequency.
+    """
+    rows = list(rows)
+    new_rows = filter_new_rows(cursor, rows)
+    if not new_rows:
+        return [], len(rows)
+
+    try:
+        cursor.executemany(INSERT_QUERY, new_rows)
+        inserted = new_rows
+    except mysql.connector.IntegrityError as error:
+        if error.errno != errorcode.ER_DUP_ENTRY:
+            raise
+        # Penyimpanan paralel sempat memasukkan sebagian baris yang sama setelah
+        # pengecekan; statement yang gagal sudah di-rollback InnoDB, jadi ulangi
+        # per baris agar baris milik penyimpanan lain tidak ikut dihitung
+        inserted = insert_rows_one_by_one(cursor, new_rows)
+    return [row[:5] for row in inserted], len(rows) - len(inserted)
@@ -0,0 +1,74 @@
+import argparse
+
+from services.dashboard_data import (
+    SENTIMENT_COUNTS_QUERY, MONTHLY_COUNTS_QUERY, YEAR_BOUNDS_QUERY, YEAR_PROBE_QUERY, year_range,
+    report_counts_query
+)
+from services.wordcloud_data import token_frequency_query
+
+# Tabel besar (nama atau alias di EXPLAIN) yang tidak boleh di-scan penuh;
+# tabel kecil seperti aspect diabaikan
+LARGE_TABLES = {'sentiment_analysis', 'term_frequency', 'sa'}
+
+
+def analytic_queries(year, aspect_id):
+    """Query analitik aplikasi beserta parameter contoh untuk EXPLAIN."""
+    return [
+        ('dashboard: sentimen per aspek', SENTIMENT_COUNTS_QUERY, year_range(year)),
+        ('dashboard: keluhan per bulan', MONTHLY_COUNTS_QUERY, year_range(year)),
+        ('daftar tahun: batas', YEAR_BOUNDS_QUERY, ()),
+        ('daftar tahun: probe', YEAR_PROBE_QUERY, year_range(year)),
+        ('laporan: semua aspek', *report_counts_query(*year_range(year))),
+        ('laporan: per aspek', *report_counts_query(*year_range(year), aspect_id)),
+        ('wordcloud: semua aspek', *token_frequency_query(year, 'all')),
+        ('wordcloud: per aspek', *token_frequency_query(year, aspect_id)),
+    ]
+
+
+def explain(connection, query, params):
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("EXPLAIN " + query, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def check(connection, year, aspect_id):
+    """Cetak rencana eksekusi dan kembalikan daftar query yang full scan."""
+    full_scans = []
+    for name, query, params in analytic_queries(year, aspect_id):
+        print(name)
+        for row in explain(connection, query, params):
+            print(f"    table={row.get('table')} type={row.get('type')} key={row.get('key')} "
+                  f"rows={row.get('rows')} extra={row.get('Extra')}")
+            if row.get('type') == 'ALL' and row.get('table') in LARGE_TABLES:
+                full_scans.append((name, row.get('table')))
+    return full_scans
+
+
+def main():
+    from config.database import get_connection, release_connection
+
+    parser = argparse.ArgumentParser(description="Pastikan query analitik memakai index (EXPLAIN)")
+    parser.add_argument('--year', type=int, default=2023)
+    parser.add_argument('--aspect-id', type=int, default=1)
+    args = parser.parse_args()
+
+    connection = get_connection()
+    if connection is None:
+        raise SystemExit(1)
+    try:
+        full_scans = check(connection, args.year, args.aspect_id)
+    finally:
+        release_connection(connection)
+
+    if full_scans:
+        for name, table in full_scans:
+            print(f"FULL SCAN: {name} ({table})")
+        raise SystemExit(1)
+    print("OK: tidak ada full table scan pada tabel besar")
+
+
+if __name__ == '__main__':
+    main()
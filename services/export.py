@@ -0,0 +1,136 @@
+import csv
+import io
+import os
+import tempfile
+
+import xlsxwriter
+
+from services.metrics import timed, timed_iter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow opsional, hanya untuk ekspor Parquet
+    pa = None
+    pq = None
+
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '5000'))
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+def parquet_available():
+    return pq is not None
+
+
+def _iter_file(path, block_size=STREAM_BLOCK_SIZE):
+    # Kirim file per blok lalu hapus setelah selesai (juga bila klien memutus koneksi)
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                yield block
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def write_xlsx(store, sheet_name='Processed Results'):
+    """Tulis hasil ke file .xlsx sementara dengan memori konstan.
+
+    Mode ``constant_memory`` xlsxwriter menulis setiap baris langsung ke
+    disk. Mengembalikan ``(iterator blok bytes, ukuran file)``; file
+    sementara dihapus setelah iterator habis.
+
+    Berbeda dengan CSV/Parquet, byte pertama baru bisa dikirim setelah
+    seluruh workbook selesai: xlsxwriter baru menyusun arsip zip .xlsx saat
+    ``workbook.close()``. Untuk data besar yang butuh respons cepat, gunakan
+    ``iter_csv`` atau ``iter_parquet``.
+    """
+    fd, path = tempfile.mkstemp(prefix='export_', suffix='.xlsx')
+    os.close(fd)
+    try:
+        with timed('export_excel', items=len(store)):
+            workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'strings_to_urls': False})
+            try:
+                worksheet = workbook.add_worksheet(sheet_name)
+                worksheet.write_row(0, 0, store.COLUMNS)
+                row_index = 1
+                for batch in store.iter_batches(EXPORT_BATCH_SIZE):
+                    for row in batch:
+                        worksheet.write_row(row_index, 0, [row[column] for column in store.COLUMNS])
+                        row_index += 1
+            finally:
+                workbook.close()
+    except Exception:
+        os.remove(path)
+        raise
+    return _iter_file(path), os.path.getsize(path)
+
+
+def iter_csv(store):
+    """Yield CSV (UTF-8 dengan BOM agar terbaca Excel) per batch hasil."""
+    return timed_iter('export_csv', _csv_blocks(store), items=len(store))
+
+
+def _csv_blocks(store):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(store.COLUMNS)
+    for batch in store.iter_batches(EXPORT_BATCH_SIZE):
+        writer.writerows([row[column] for column in store.COLUMNS] for row in batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """File tujuan ParquetWriter yang menampung bytes sampai diambil generator."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_parquet(store):
+    """Yield file Parquet; setiap batch hasil menjadi satu row group."""
+    if pq is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+    return timed_iter('export_parquet', _parquet_blocks(store), items=len(store))
+
+
+def _parquet_blocks(store):
+    schema = pa.schema([(column, pa.string()) for column in store.COLUMNS])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for batch in store.iter_batches(EXPORT_BATCH_SIZE):
+            table = pa.Table.from_pydict(
+                {column: [row[column] for row in batch] for column in store.COLUMNS}, schema=schema)
+            writer.write_table(table)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,65 @@
+import gzip
+import hashlib
+from datetime import datetime, timezone
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:  # brotli opsional; tanpa paket ini hanya gzip
+    brotli = None
+
+# Body lebih kecil dari ini tidak dikompres (overhead header lebih besar)
+MIN_COMPRESS_SIZE = 512
+
+
+class CompressedBody:
+    """Body respons beserta varian gzip/brotli dan ETag-nya.
+
+    Kompresi dilakukan sekali saat objek dibuat sehingga body yang di-cache
+    (mis. per versi data) tidak dikompres ulang di setiap request.
+    """
+
+    def __init__(self, body, mimetype, last_modified=None):
+        self.mimetype = mimetype
+        self.last_modified = last_modified
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+        self.variants = {'identity': body}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.variants['gzip'] = gzip.compress(body, compresslevel=6, mtime=0)
+            if brotli is not None:
+                self.variants['br'] = brotli.compress(body, quality=9)
+
+    def choose(self, accept_encodings):
+        """Varian terkecil yang diterima klien: ``(encoding, body)``."""
+        best = 'identity'
+        for encoding, body in self.variants.items():
+            if encoding != 'identity' and accept_encodings[encoding] and \
+                    len(body) < len(self.variants[best]):
+                best = encoding
+        return best, self.variants[best]
+
+
+def last_modified_from(timestamp):
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+
+
+def conditional_response(request, content, max_age=0):
+    """Respons dengan ETag/Last-Modified dan kompresi; 304 bila tidak berubah.
+
+    ``content`` berupa ``CompressedBody``. Varian terkompresi memakai ETag
+    berbeda (sufiks encoding) sesuai aturan cache untuk ``Vary``.
+    """
+    encoding, body = content.choose(request.accept_encodings)
+    response = Response(body, mimetype=content.mimetype)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f"{content.etag}-{encoding}")
+    else:
+        response.set_etag(content.etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    if content.last_modified is not None:
+        response.last_modified = content.last_modified
+    # Boleh disimpan browser/reverse proxy tetapi selalu divalidasi ulang
+    response.headers['Cache-Control'] = f"public, max-age={max_age}, must-revalidate"
+    return response.make_conditional(request)
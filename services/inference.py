@@ -0,0 +1,111 @@
+import numpy as np
+
+from services.metrics import timed
+
+
+class InferenceService:
+    """Facade atas pipeline sentimen dan topik dengan satu kali preprocessing.
+
+    Kedua pipeline diawali ``TextPreprocessor`` dengan konfigurasi pembersihan
+    yang sama; yang berbeda hanya stemming dan tokenisasi. Teks dibersihkan
+    sekali, di-stem sekali bila salah satu pipeline membutuhkannya, lalu
+    diteruskan ke langkah-langkah berikutnya dari masing-masing pipeline.
+    """
+
+    def __init__(self, sentiment_pipeline, topic_pipeline, cache=None):
+        if sentiment_pipeline is None or topic_pipeline is None:
+            raise ValueError("sentiment_pipeline and topic_pipeline cannot be None")
+        self.sentiment_pipeline = sentiment_pipeline
+        self.topic_pipeline = topic_pipeline
+        self.preprocessor = topic_pipeline.named_steps['preprocessor']
+        self.sentiment_preprocessor = sentiment_pipeline.named_steps['preprocessor']
+
+        # Langkah setelah preprocessor pada masing-masing pipeline
+        self.sentiment_steps = sentiment_pipeline[1:]
+        self.topic_steps = topic_pipeline[1:]
+
+        # PredictionCache opsional; dipakai oleh analyze_batch dan analyze
+        self.cache = cache
+
+    @staticmethod
+    def _shape(preprocessor, cleaned, stemmed):
+        text = stemmed if preprocessor.do_stemming else cleaned
+        return text.split() if preprocessor.do_tokens else text
+
+    def preprocess_batch(self, texts):
+        """Kembalikan input untuk pipeline sentimen dan pipeline topik."""
+        stem = self.preprocessor.do_stemming or self.sentiment_preprocessor.do_stemming
+        pairs = self.preprocessor.preprocess_pairs(texts, stem=stem)
+        cleaned = [pair[0] for pair in pairs]
+        stemmed = [pair[1] for pair in pairs]
+
+        sentiment_input = [self._shape(self.sentiment_preprocessor, c, s) for c, s in zip(cleaned, stemmed)]
+        topic_input = [self._shape(self.preprocessor, c, s) for c, s in zip(cleaned, stemmed)]
+        return sentiment_input, topic_input
+
+    def analyze_batch(self, texts):
+        """Analisis sekumpulan teks sekaligus.
+
+        Mengembalikan dict berisi ``tokens`` (hasil preprocessing pipeline
+        topik), ``sentiments`` (label dari classifier) dan ``topic_vectors``
+        (matriks distribusi topik, satu baris per teks). Bila ada cache,
+        hanya teks yang belum pernah diprediksi yang dihitung.
+        """
+        texts = list(texts)
+        if not texts:
+            return {'tokens': [], 'sentiments': [], 'topic_vectors': np.zeros((0, 0))}
+        if self.cache is None:
+            return self._analyze_uncached(texts)
+
+        # Teks non-string tidak di-cache; key-nya berupa indeks agar tetap unik
+        keys = [self.cache.key(text) if isinstance(text, str) else offset for offset, text in enumerate(texts)]
+        entries = self.cache.get_many([key for key in keys if isinstance(key, str)])
+
+        pending = {}
+        for text, key in zip(texts, keys):
+            if key not in entries and key not in pending:
+                pending[key] = text
+        if pending:
+            computed = self._analyze_uncached(list(pending.values()))
+            new_entries = {
+                key: {
+                    'tokens': computed['tokens'][offset],
+                    'sentiment': computed['sentiments'][offset],
+                    # Salinan, bukan view: entri cache tidak menahan seluruh matriks batch
+                    'topic_vector': computed['topic_vectors'][offset].copy()
+                }
+                for offset, key in enumerate(pending)
+            }
+            self.cache.set_many({key: entry for key, entry in new_entries.items() if isinstance(key, str)})
+            entries.update(new_entries)
+
+        ordered = [entries[key] for key in keys]
+        return {
+            'tokens': [entry['tokens'] for entry in ordered],
+            'sentiments': [entry['sentiment'] for entry in ordered],
+            'topic_vectors': np.vstack([entry['topic_vector'] for entry in ordered])
+        }
+
+    def _analyze_uncached(self, texts):
+        with timed('preprocess', items=len(texts)):
+            sentiment_input, topic_input = self.preprocess_batch(texts)
+        with timed('sentiment_predict', items=len(texts)):
+            sentiments = self.sentiment_steps.predict(sentiment_input)
+        with timed('topic_transform', items=len(texts)):
+            topic_vectors = np.asarray(self.topic_steps.transform(topic_input))
+        tokens = [doc if isinstance(doc, list) else doc.split() for doc in topic_input]
+
+        return {
+            'tokens': tokens,
+            'sentiments': list(sentiments),
+            'topic_vectors': topic_vectors
+        }
+
+    def analyze(self, text):
+        """Analisis satu teks; hasilnya satu dict dengan vektor topik 1-D."""
+        batch = self.analyze_batch([text])
+        return {
+            'tokens': batch['tokens'][0],
+            'sentiment': batch['sentiments'][0],
+            'topic_vector': batch['topic_vectors'][0].copy()
+        }
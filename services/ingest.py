@@ -0,0 +1,95 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+REQUIRED_COLUMNS = ['keluhan', 'tanggal_keluhan']
+
+
+class UploadFormatError(ValueError):
+    pass
+
+
+def _check_columns(columns):
+    if not all(column in columns for column in REQUIRED_COLUMNS):
+        raise UploadFormatError(f"Missing required columns: {REQUIRED_COLUMNS}")
+
+
+def _iter_csv_chunks(file, chunk_size):
+    try:
+        reader = pd.read_csv(file, chunksize=chunk_size)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise UploadFormatError(f"Error reading file: {e}")
+
+    while True:
+        try:
+            chunk = next(reader)
+        except StopIteration:
+            break
+        except (pd.errors.ParserError, UnicodeDecodeError) as e:
+            raise UploadFormatError(f"Error reading file: {e}")
+        _check_columns(chunk.columns)
+        yield chunk
+
+
+def _iter_xlsx_chunks(file, chunk_size):
+    # Mode read-only membaca sheet baris demi baris tanpa memuat seluruh workbook
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise UploadFormatError(f"Error reading file: {e}")
+
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise UploadFormatError(f"Missing required columns: {REQUIRED_COLUMNS}")
+        columns = [str(value).strip() if value is not None else '' for value in header]
+        _check_columns(columns)
+
+        buffer = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append(row[:len(columns)])
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=columns)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+
+def iter_upload_chunks(file, filename, chunk_size):
+    """Baca file unggahan (CSV/XLSX) sebagai DataFrame berukuran ``chunk_size``."""
+    chunk_size = max(1, int(chunk_size))
+    if filename.endswith('.xlsx'):
+        return _iter_xlsx_chunks(file, chunk_size)
+    if filename.endswith('.csv'):
+        return _iter_csv_chunks(file, chunk_size)
+    raise UploadFormatError("Unsupported file format. Please use Excel or CSV.")
+
+
+def estimate_total_rows(path, filename):
+    """Perkiraan jumlah baris data (tanpa header) untuk menghitung progres."""
+    try:
+        if filename.endswith('.xlsx'):
+            workbook = load_workbook(path, read_only=True)
+            try:
+                max_row = workbook.active.max_row
+            finally:
+                workbook.close()
+            return max(0, max_row - 1) if max_row else None
+
+        if filename.endswith('.csv'):
+            lines = 0
+            last_block = b''
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    lines += block.count(b'\n')
+                    last_block = block
+            if last_block and not last_block.endswith(b'\n'):
+                lines += 1
+            return max(0, lines - 1)
+    except Exception as e:
+        print(f"Warning: Could not estimate row count: {e}")
+    return None
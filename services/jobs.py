@@ -0,0 +1,192 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Atribut Job yang disimpan ke file status agar terbaca semua worker
+STATE_FIELDS = ('id', 'filename', 'status', 'total_rows', 'rows_done', 'error',
+                'created_at', 'started_at', 'finished_at', 'result_path')
+
+
+class Job:
+    """Status satu pekerjaan analisis file yang berjalan di background."""
+
+    def __init__(self, filename, total_rows=None, job_id=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.filename = filename
+        self.status = 'queued'
+        self.total_rows = total_rows
+        self.rows_done = 0
+        self.error = None
+        self.result = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result_path = None
+        self.state_path = None
+        self._cleanup = []
+
+    def add_cleanup(self, func):
+        self._cleanup.append(func)
+
+    def update_progress(self, rows_done):
+        self.rows_done = rows_done
+        self.save()
+
+    def save(self):
+        """Tulis status job ke ``state_path`` (atomik, lewat file sementara)."""
+        if not self.state_path:
+            return
+        state = {field: getattr(self, field) for field in STATE_FIELDS}
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='job_', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                    json.dump(state, file)
+                os.replace(tmp_path, self.state_path)
+            except Exception:
+                os.remove(tmp_path)
+                raise
+        except Exception as e:
+            print(f"Warning: failed to save state of job {self.id}: {e}")
+
+    @classmethod
+    def load(cls, state_path, open_result=None):
+        """Job dari file status (mis. milik worker lain), atau None."""
+        try:
+            with open(state_path, encoding='utf-8') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return None
+        job = cls(state['filename'], job_id=state['id'])
+        for field in STATE_FIELDS:
+            setattr(job, field, state.get(field))
+        if job.status == 'done' and job.result_path and open_result is not None:
+            if not os.path.exists(job.result_path):
+                return None
+            job.result = open_result(job.result_path)
+        return job
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed')
+
+    def progress(self):
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        rows_per_sec = self.rows_done / elapsed if elapsed > 0 else 0.0
+
+        percent = None
+        eta_seconds = None
+        if self.status == 'done':
+            percent = 100.0
+            eta_seconds = 0.0
+        elif self.total_rows:
+            percent = min(100.0, self.rows_done / self.total_rows * 100)
+            if rows_per_sec > 0:
+                eta_seconds = max(0.0, (self.total_rows - self.rows_done) / rows_per_sec)
+
+        return {
+            'job_id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'rows_done': self.rows_done,
+            'total_rows': self.total_rows,
+            'percent': percent,
+            'rows_per_sec': rows_per_sec,
+            'elapsed_seconds': elapsed,
+            'eta_seconds': eta_seconds,
+            'error': self.error
+        }
+
+
+class JobManager:
+    """Menjalankan Job pada thread pool dan menyimpan riwayat job terbaru.
+
+    Bila ``state_dir`` diisi, status setiap job juga ditulis ke
+    ``<state_dir>/job_<id>.json`` sehingga worker gunicorn lain bisa membaca
+    status dan hasilnya; ``open_result(path)`` membuka kembali hasil job
+    dari path-nya (atribut ``path`` milik hasil ``func``).
+    """
+
+    def __init__(self, max_workers=2, max_jobs=20, state_dir=None, open_result=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        self.max_jobs = max_jobs
+        self.state_dir = state_dir
+        self.open_result = open_result
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _state_path(self, job_id):
+        # job_id berasal dari URL; hanya hex uuid yang valid sebagai nama file
+        if not self.state_dir or not job_id.isalnum():
+            return None
+        return os.path.join(self.state_dir, f"job_{job_id}.json")
+
+    def submit(self, job, func, *args, **kwargs):
+        """Jalankan ``func(job, *args, **kwargs)``; hasilnya disimpan di ``job.result``."""
+        if self.state_dir:
+            os.makedirs(self.state_dir, exist_ok=True)
+            job.state_path = self._state_path(job.id)
+            # Hapus file status lebih dulu agar worker lain tidak membuka hasil yang sudah dihapus
+            job.add_cleanup(lambda: os.remove(job.state_path))
+        job.save()
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        job.status = 'running'
+        job.started_at = time.time()
+        job.save()
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.result_path = getattr(job.result, 'path', None)
+            job.status = 'done'
+        except Exception as e:
+            print(f"Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.finished_at = time.time()
+            job.save()
+
+    def _evict(self):
+        # Buang job selesai yang paling lama beserta file hasilnya
+        while len(self._jobs) > self.max_jobs:
+            old_id = next((job_id for job_id, job in self._jobs.items() if job.finished), None)
+            if old_id is None:
+                break
+            old_job = self._jobs.pop(old_id)
+            for cleanup in old_job._cleanup:
+                try:
+                    cleanup()
+                except Exception as e:
+                    print(f"Warning: cleanup for job {old_id} failed: {e}")
+
+    def get(self, job_id):
+        """Job milik worker ini, atau dibaca dari file status bila milik worker lain."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        state_path = self._state_path(job_id)
+        if state_path is None:
+            return None
+        return Job.load(state_path, self.open_result)
+
+    def counts(self):
+        """Jumlah job per status."""
+        counts = {}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
@@ -0,0 +1,243 @@
+import bisect
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+# Batas bucket histogram latensi (detik)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class _Metric:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _header(self, kind):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {kind}"]
+
+
+class Counter(_Metric):
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = self._header('counter')
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram(_Metric):
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key label -> [jumlah per bucket, total, jumlah observasi]
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self):
+        lines = self._header('histogram')
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', bound))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', '+Inf'))} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class GaugeCallback(_Metric):
+    """Gauge yang nilainya dibaca saat /metrics diminta.
+
+    ``func`` mengembalikan angka atau dict ``{tuple label: angka}``.
+    """
+
+    def __init__(self, name, documentation, func, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.func = func
+
+    def render(self):
+        lines = self._header('gauge')
+        try:
+            values = self.func()
+        except Exception as e:
+            print(f"Warning: metric {self.name} failed: {e}")
+            return lines
+        if not isinstance(values, dict):
+            values = {(): values}
+        for key, value in values.items():
+            if value is None:
+                continue
+            key = key if isinstance(key, tuple) else (key,)
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {float(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, func, labelnames=()):
+        return self._register(GaugeCallback(name, documentation, func, labelnames))
+
+    def render(self):
+        """Semua metrik dalam format teks Prometheus."""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Registry untuk proses ini (setiap worker gunicorn punya registry sendiri)
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    'sentimen_stage_seconds', 'Durasi per tahap pemrosesan', ['stage'])
+STAGE_ITEMS = registry.counter(
+    'sentimen_stage_items_total', 'Jumlah item (teks/baris) yang diproses per tahap', ['stage'])
+STAGE_ERRORS = registry.counter(
+    'sentimen_stage_errors_total', 'Jumlah error per tahap', ['stage'])
+REQUEST_SECONDS = registry.histogram(
+    'sentimen_http_request_seconds', 'Latensi request HTTP', ['endpoint', 'method', 'status'])
+
+
+def observe_stage(stage, seconds, items=None):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if items is not None:
+        STAGE_ITEMS.inc(items, stage=stage)
+
+
+@contextmanager
+def timed(stage, items=None):
+    """Catat durasi blok kode ke histogram ``sentimen_stage_seconds``."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        observe_stage(stage, time.perf_counter() - start, items)
+
+
+def timed_iter(stage, iterable, items=None):
+    """Seperti ``timed`` untuk generator yang di-stream ke klien.
+
+    Hanya waktu menghasilkan setiap elemen (fetch/encode di antara ``yield``)
+    yang dicatat; waktu menunggu konsumen, mis. klien yang lambat, tidak.
+    """
+    iterator = iter(iterable)
+    seconds = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                value = next(iterator)
+            except StopIteration:
+                break
+            except Exception:
+                STAGE_ERRORS.inc(stage=stage)
+                raise
+            finally:
+                seconds += time.perf_counter() - start
+            yield value
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+        observe_stage(stage, seconds, items)
+
+
+class RequestProfiler:
+    """Profiling cProfile untuk sebagian request (``sample_rate`` 0..1).
+
+    Laporan ``.prof`` (untuk snakeviz/pstats) dan ringkasan teks 50 fungsi
+    teratas ditulis ke ``output_dir``.
+    """
+
+    def __init__(self, sample_rate=0.0, output_dir='profiles', top=50):
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.output_dir = output_dir
+        self.top = top
+
+    def start(self):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Profiler lain sedang aktif (request paralel yang juga di-sample)
+            return None
+        return profiler
+
+    def finish(self, profiler, name):
+        profiler.disable()
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+        base = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}_{safe_name}")
+        profiler.dump_stats(base + '.prof')
+
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(self.top)
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+        return base
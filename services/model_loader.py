@@ -0,0 +1,111 @@
+import os
+import time
+
+import joblib
+
+from models.LDATransformer import LDATransformer
+from models.TextPreprocessor import TextPreprocessor, NORMALIZATION_DICT_PATH
+from services.inference import InferenceService
+from services.prediction_cache import PredictionCache, model_fingerprint
+
+TOPIC_MODEL_PATH = os.path.join('models', 'pipeline_topic.pkl')
+SENTIMENT_MODEL_PATH = os.path.join('models', 'pipeline_sentiment.pkl')
+
+WARMUP_TEXT = "jalan rusak di depan rumah belum diperbaiki"
+
+# Parameter preprocessor yang hanya memengaruhi kecepatan, bukan hasil
+PERFORMANCE_PARAMS = ('stem_cache_size', 'n_jobs', 'chunk_size')
+
+
+def register_pickle_aliases():
+    """Daftarkan kelas model di ``__main__``.
+
+    Pipeline di-pickle dari skrip sehingga kelasnya tercatat sebagai
+    ``__main__.TextPreprocessor`` dan ``__main__.LDATransformer``. Alias ini
+    membuat model dapat dimuat saat app diimpor sebagai modul (gunicorn).
+    """
+    import __main__
+    for cls in (TextPreprocessor, LDATransformer):
+        if not hasattr(__main__, cls.__name__):
+            setattr(__main__, cls.__name__, cls)
+
+
+def memory_usage():
+    """RSS, PSS dan memori bersama proses ini dalam MB (Linux), atau RSS puncak."""
+    usage = {'pid': os.getpid()}
+    try:
+        with open('/proc/self/smaps_rollup', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty'):
+                    usage[key.lower() + '_mb'] = int(value.split()[0]) / 1024
+        return usage
+    except OSError:
+        pass
+    try:
+        import resource
+        usage['max_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        pass
+    return usage
+
+
+def preprocessing_config(*preprocessors):
+    """Konfigurasi preprocessor yang menentukan hasilnya, untuk fingerprint cache."""
+    return [
+        {
+            'params': {name: value for name, value in preprocessor.get_params().items()
+                       if name not in PERFORMANCE_PARAMS},
+            'stopwords_id': sorted(set(preprocessor.stopwords_id)),
+            'stopwords_en': sorted(preprocessor.stopwords_en),
+            'text_to_remove': sorted(set(preprocessor.text_to_remove))
+        }
+        for preprocessor in preprocessors
+    ]
+
+
+def load_models(topic_path=TOPIC_MODEL_PATH, sentiment_path=SENTIMENT_MODEL_PATH, mmap_mode='r', warmup=True,
+                cache_size=0, cache_path=None, cache_disk_max_rows=100000):
+    """Muat kedua pipeline dan bangun InferenceService.
+
+    Dengan ``mmap_mode='r'`` array NumPy di dalam file joblib (matriks LDA,
+    parameter Naive Bayes) di-memory-map read-only sehingga halaman memorinya
+    dipakai bersama oleh semua worker dan page cache. Prediksi warm-up
+    menjalankan seluruh jalur inferensi sekali sebelum request pertama.
+    ``cache_size``/``cache_path`` mengaktifkan PredictionCache (LRU dan
+    SQLite) dengan key yang terikat pada fingerprint file model, kamus
+    normalisasi dan konfigurasi preprocessor.
+    Mengembalikan ``(topic_model, sentiment_model, inference_service, stats)``.
+    """
+    register_pickle_aliases()
+
+    start = time.perf_counter()
+    topic_model = joblib.load(topic_path, mmap_mode=mmap_mode)
+    sentiment_model = joblib.load(sentiment_path, mmap_mode=mmap_mode)
+    inference_service = InferenceService(sentiment_model, topic_model)
+    load_seconds = time.perf_counter() - start
+
+    warmup_seconds = None
+    if warmup:
+        start = time.perf_counter()
+        inference_service.analyze(WARMUP_TEXT)
+        warmup_seconds = time.perf_counter() - start
+
+    fingerprint = model_fingerprint(
+        topic_path, sentiment_path, NORMALIZATION_DICT_PATH,
+        config=preprocessing_config(inference_service.preprocessor, inference_service.sentiment_preprocessor)
+    )
+    if cache_size or cache_path:
+        inference_service.cache = PredictionCache(fingerprint, maxsize=cache_size, path=cache_path,
+                                                  disk_max_rows=cache_disk_max_rows)
+
+    stats = {
+        'mmap_mode': mmap_mode,
+        'load_seconds': load_seconds,
+        'warmup_seconds': warmup_seconds,
+        'fingerprint': fingerprint,
+        'loaded_by_pid': os.getpid()
+    }
+    warmup_info = f", warm-up {warmup_seconds:.2f}s" if warmup_seconds is not None else ""
+    print(f"Models loaded in {load_seconds:.2f}s (mmap_mode={mmap_mode}{warmup_info})")
+    return topic_model, sentiment_model, inference_service, stats
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def model_fingerprint(*paths, config=None):
+    """Hash isi file model dan data pendukungnya serta konfigurasi preprocessing.
+
+    Berubah setiap kali .pkl, kamus normalisasi atau ``config`` (dict yang
+    bisa di-JSON-kan, mis. mode dan stopword preprocessor) berubah. File yang
+    tidak ada tetap ikut dibedakan dari file kosong.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.exists(path):
+            digest.update(b'\x00missing:' + path.encode('utf-8'))
+            continue
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    if config is not None:
+        digest.update(json.dumps(config, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class PredictionCache:
+    """Cache hasil prediksi per teks: tier LRU di memori + tier SQLite opsional.
+
+    Key adalah SHA-256 dari fingerprint model dan teks apa adanya, jadi entri
+    dari model lama otomatis tidak terpakai setelah model diganti. Nilai
+    berisi ``tokens``, ``sentiment`` dan ``topic_vector``. Tier SQLite
+    dibatasi ``disk_max_rows`` baris; entri tertua dibuang lebih dulu.
+    """
+
+    def __init__(self, fingerprint, maxsize=10000, path=None, disk_max_rows=100000):
+        self.fingerprint = fingerprint
+        self.maxsize = max(0, maxsize)
+        self.path = path
+        self.disk_max_rows = max(0, disk_max_rows)
+        self._disk_rows = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS predictions (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+                )
+                self._disk_rows = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+            self._prune_disk()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def key(self, text):
+        value = f"{self.fingerprint}\x1f{text}"
+        return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _encode(entry):
+        return json.dumps({
+            'tokens': entry['tokens'],
+            'sentiment': entry['sentiment'],
+            'topic_vector': [float(p) for p in entry['topic_vector']]
+        })
+
+    @staticmethod
+    def _decode(value):
+        entry = json.loads(value)
+        entry['topic_vector'] = np.asarray(entry['topic_vector'])
+        return entry
+
+    def _remember(self, key, entry):
+        if not self.maxsize:
+            return
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get_many(self, keys):
+        """Kembalikan ``{key: entry}`` untuk key yang ada di cache."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is not None:
+                    self._data.move_to_end(key)
+                    found[key] = entry
+            self.memory_hits += len(found)
+
+        missing = [key for key in keys if key not in found]
+        if self.path and missing:
+            disk_found = self._read_disk(missing)
+            with self._lock:
+                for key, entry in disk_found.items():
+                    self._remember(key, entry)
+                self.disk_hits += len(disk_found)
+            found.update(disk_found)
+
+        with self._lock:
+            self.misses += len(keys) - len(found)
+        return found
+
+    def _read_disk(self, keys, chunk_size=500):
+        found = {}
+        connection = self._connect()
+        try:
+            for start in range(0, len(keys), chunk_size):
+                chunk = keys[start:start + chunk_size]
+                placeholders = ', '.join(['?'] * len(chunk))
+                rows = connection.execute(
+                    f"SELECT key, value FROM predictions WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = self._decode(value)
+        finally:
+            connection.close()
+        return found
+
+    def set_many(self, entries):
+        """Simpan ``{key: entry}`` ke kedua tier."""
+        if not entries:
+            return
+        with self._lock:
+            for key, entry in entries.items():
+                self._remember(key, entry)
+
+        if self.path:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO predictions (key, value) VALUES (?, ?)",
+                        [(key, self._encode(entry)) for key, entry in entries.items()]
+                    )
+            finally:
+                connection.close()
+            with self._lock:
+                # Perkiraan atas (REPLACE tidak menambah baris); dihitung ulang saat prune
+                self._disk_rows += len(entries)
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Buang entri tertua (rowid terkecil) bila tier SQLite melewati batas.
+
+        Dipangkas sampai 90% batas agar tidak terjadi di setiap ``set_many``.
+        """
+        if not self.disk_max_rows or self._disk_rows <= self.disk_max_rows:
+            return
+        connection = self._connect()
+        try:
+            with connection:
+                rows = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+                excess = rows - int(self.disk_max_rows * 0.9) if rows > self.disk_max_rows else 0
+                if excess > 0:
+                    connection.execute(
+                        "DELETE FROM predictions WHERE rowid IN "
+                        "(SELECT rowid FROM predictions ORDER BY rowid LIMIT ?)", (excess,)
+                    )
+        finally:
+            connection.close()
+        with self._lock:
+            self._disk_rows = rows - excess
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        if self.path:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute("DELETE FROM predictions")
+            finally:
+                connection.close()
+            with self._lock:
+                self._disk_rows = 0
+
+    def stats(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                'fingerprint': self.fingerprint,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'disk_path': self.path,
+                'disk_rows': self._disk_rows,
+                'disk_max_rows': self.disk_max_rows,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': hits / total if total else 0.0
+            }
@@ -0,0 +1,141 @@
+import io
+from datetime import datetime, timedelta
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+
+
+def report_range(start=None, end=None, year=None, month=None):
+    """Rentang setengah terbuka ``[awal, akhir)`` dari parameter laporan.
+
+    Bisa berupa ``start``/``end`` (``YYYY-MM-DD``, ``end`` inklusif) atau
+    ``year`` dengan ``month`` opsional. Melempar ValueError bila tidak valid,
+    termasuk bila akhir rentang melewati tahun 9999.
+    """
+    try:
+        return _report_range(start, end, year, month)
+    except OverflowError:
+        raise ValueError("Date out of range")
+
+
+def _report_range(start, end, year, month):
+    if year:
+        if not str(year).isdigit() or len(str(year)) != 4:
+            raise ValueError("Invalid year format")
+        year = int(year)
+        if not month:
+            return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+        if not str(month).isdigit() or not 1 <= int(month) <= 12:
+            raise ValueError("Invalid month")
+        month = int(month)
+        first = datetime(year, month, 1)
+        return first, datetime(year + month // 12, month % 12 + 1, 1)
+
+    if not start or not end:
+        raise ValueError("Missing start/end date or year")
+    try:
+        first = datetime.strptime(start, '%Y-%m-%d')
+        last = datetime.strptime(end, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError("Invalid date format, expected YYYY-MM-DD")
+    if last < first:
+        raise ValueError("End date is before start date")
+    return first, last + timedelta(days=1)
+
+
+def build_summary_pdf(summary, period=None, aspect=None):
+    """PDF ringkasan jumlah sentimen negatif dan netral per aspek.
+
+    ``summary`` adalah ``CountSummary``; ``period`` berupa ``(awal, akhir)``
+    setengah terbuka dan ``aspect`` nama aspek bila laporan difilter.
+    Mengembalikan bytes PDF.
+    """
+    output = io.BytesIO()
+    try:
+        pdf = SimpleDocTemplate(output, pagesize=landscape(A4),
+                                leftMargin=1 * cm, rightMargin=1 * cm,
+                                topMargin=2.5 * cm, bottomMargin=2 * cm)
+        elements = []
+
+        # Styles
+        styles = getSampleStyleSheet()
+        title_style = styles['Heading1']
+        subtitle_style = styles['Normal']
+        subtitle_style.spaceAfter = 12
+        subtitle_style.spaceBefore = 12
+
+        # Header
+        current_date = datetime.now().strftime("%d %B %Y, %H:%M:%S")
+        elements.append(Paragraph("Laporan Analisis Sentimen Berbasis Aspek", title_style))
+        elements.append(Paragraph(f"Kota Surabaya - Tanggal Pembuatan: {current_date}", subtitle_style))
+        if period is not None:
+            first, end = period
+            last = end - timedelta(days=1)
+            elements.append(Paragraph(
+                f"Periode: {first.strftime('%d %B %Y')} - {last.strftime('%d %B %Y')}", subtitle_style))
+        if aspect:
+            elements.append(Paragraph(f"Aspek: {aspect}", subtitle_style))
+        elements.append(Paragraph(
+            "Laporan ini menyajikan jumlah sentimen negatif dan netral berdasarkan aspek/topik "
+            "pengaduan warga Kota Surabaya.", subtitle_style))
+        elements.append(Spacer(1, 0.5 * cm))
+
+        # Define column widths
+        col_widths = [14 * cm, 4 * cm, 4 * cm]
+
+        # Header dan data tabel
+        negatif = summary.matrix[:, summary.sentiments.index('negatif')].tolist()
+        netral = summary.matrix[:, summary.sentiments.index('netral')].tolist()
+        data = [['Aspek/Topik', 'Jumlah Sentimen Negatif', 'Jumlah Sentimen Netral']]
+        data.extend([topik, neg, net] for topik, neg, net in zip(summary.aspects, negatif, netral))
+
+        # Tambahkan total
+        data.append(['Total', summary.count('negatif'), summary.count('netral')])
+
+        # Buat tabel
+        table = Table(data, colWidths=col_widths)
+
+        # Gaya tabel
+        style = TableStyle([
+            # Header style
+            ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+
+            # Data style
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),  # Align jumlah
+            ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
+            ('TEXTCOLOR', (0, 1), (-1, -2), colors.black),
+            ('LINEBELOW', (0, 1), (-1, -2), 0.25, colors.grey),
+
+            # Total row style
+            ('BACKGROUND', (0, -1), (-1, -1), colors.lightblue),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('ALIGN', (0, -1), (-1, -1), 'CENTER'),
+
+            # Table borders
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ])
+        table.setStyle(style)
+
+        # Tambahkan tabel ke elemen
+        elements.append(table)
+
+        # Footer
+        footer_note = Paragraph(
+            "Laporan ini dihasilkan oleh sistem analisis sentimen berbasis aspek "
+            "untuk pengaduan warga Kota Surabaya.", subtitle_style)
+        elements.extend([Spacer(1, 1 * cm), footer_note])
+
+        # Bangun PDF
+        pdf.build(elements)
+        return output.getvalue()
+    finally:
+        output.close()
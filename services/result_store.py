@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import tempfile
+import threading
+
+# Folder penyimpanan hasil analisis di disk
+RESULT_STORE_DIR = os.getenv('RESULT_STORE_DIR', os.path.join('uploads', 'results'))
+
+
+class ResultStore:
+    """Penyimpanan hasil analisis file berbasis SQLite di disk.
+
+    Hasil ditulis per chunk sehingga memori tidak bertambah seiring jumlah
+    baris; pembacaan juga dilakukan per batch.
+    """
+
+    COLUMNS = ('tanggal', 'keluhan', 'preprocessed_text', 'sentimen', 'topik', 'instansi')
+
+    def __init__(self, path=None):
+        if path is None:
+            os.makedirs(RESULT_STORE_DIR, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix='results_', suffix='.sqlite3', dir=RESULT_STORE_DIR)
+            os.close(fd)
+        self.path = path
+        self._lock = threading.Lock()
+        self._count = 0
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "id INTEGER PRIMARY KEY, tanggal TEXT, keluhan TEXT, preprocessed_text TEXT, "
+                "sentimen TEXT, topik TEXT, instansi TEXT)"
+            )
+            self._count = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def append(self, rows):
+        values = [tuple(row[column] for column in self.COLUMNS) for row in rows]
+        if not values:
+            return
+        with self._lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO results (tanggal, keluhan, preprocessed_text, sentimen, topik, instansi) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        values
+                    )
+            finally:
+                connection.close()
+            self._count += len(values)
+
+    def __len__(self):
+        return self._count
+
+    def iter_batches(self, batch_size=1000):
+        """Yield daftar dict hasil per batch, urut sesuai baris file."""
+        connection = self._connect()
+        try:
+            cursor = connection.execute(
+                "SELECT tanggal, keluhan, preprocessed_text, sentimen, topik, instansi FROM results ORDER BY id"
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [dict(zip(self.COLUMNS, row)) for row in rows]
+        finally:
+            connection.close()
+
+    def head(self, limit):
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT tanggal, keluhan, preprocessed_text, sentimen, topik, instansi FROM results ORDER BY id LIMIT ?",
+                (limit,)
+            ).fetchall()
+        finally:
+            connection.close()
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+    def delete(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,133 @@
+import argparse
+import json
+import time
+from collections import Counter
+from datetime import datetime
+
+from services.cache import data_version
+
+# Panjang maksimum token sesuai kolom term_frequency.token
+MAX_TOKEN_LENGTH = 100
+
+UPSERT_QUERY = """
+    INSERT INTO term_frequency (tahun, bulan, aspect_id, sentimen, token, frekuensi)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE frekuensi = frekuensi + VALUES(frekuensi)
+"""
+
+
+def tokens_from_json(value):
+    """Ubah isi kolom preprocessed_text (JSON list) menjadi daftar token."""
+    if not value:
+        return []
+    try:
+        tokens = json.loads(value)
+    except (TypeError, json.JSONDecodeError):
+        return []
+    if isinstance(tokens, str):
+        return tokens.split()
+    if isinstance(tokens, list):
+        return [str(token) for token in tokens]
+    return []
+
+
+def _year_month(tanggal):
+    if isinstance(tanggal, str):
+        tanggal = datetime.strptime(tanggal[:19], '%Y-%m-%d %H:%M:%S')
+    return tanggal.year, tanggal.month
+
+
+def count_terms(rows):
+    """Hitung frekuensi token per (tahun, bulan, aspect_id, sentimen, token).
+
+    ``rows`` berisi tuple ``(tanggal_keluhan, aspect_id, sentimen,
+    preprocessed_text)`` dengan preprocessed_text berupa string JSON.
+    """
+    counts = Counter()
+    for tanggal, aspect_id, sentimen, preprocessed_text in rows:
+        tokens = tokens_from_json(preprocessed_text)
+        if not tokens:
+            continue
+        tahun, bulan = _year_month(tanggal)
+        # aspect_id kosong (NULL/NaN) dicatat sebagai 0
+        aspect_key = int(aspect_id) if aspect_id is not None and aspect_id == aspect_id else 0
+        prefix = (tahun, bulan, aspect_key, sentimen)
+        for token in tokens:
+            counts[prefix + (token[:MAX_TOKEN_LENGTH],)] += 1
+    return counts
+
+
+def upsert_term_frequencies(cursor, counts, batch_size=1000):
+    """Tambahkan hasil count_terms ke tabel term_frequency (tanpa commit)."""
+    rows = [key + (frekuensi,) for key, frekuensi in counts.items()]
+    for start in range(0, len(rows), batch_size):
+        cursor.executemany(UPSERT_QUERY, rows[start:start + batch_size])
+    return len(rows)
+
+
+def rebuild_term_frequencies(connection, batch_size=5000):
+    """Bangun ulang seluruh rollup dari tabel sentiment_analysis."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM term_frequency")
+
+        last_id = 0
+        processed = 0
+        start_time = time.perf_counter()
+        while True:
+            # Keyset pagination pada primary key agar tidak memuat seluruh tabel
+            cursor.execute(
+                """
+                SELECT id, tanggal_keluhan, aspect_id, sentimen, preprocessed_text
+                FROM sentiment_analysis
+                WHERE id > %s
+                ORDER BY id
+                LIMIT %s
+                """,
+                (last_id, batch_size)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            last_id = rows[-1][0]
+            processed += len(rows)
+            upsert_term_frequencies(cursor, count_terms(row[1:] for row in rows))
+            elapsed = time.perf_counter() - start_time
+            print(f"Rebuilt term frequencies for {processed} rows ({processed / elapsed:.1f} rows/sec)")
+
+        # Word cloud yang di-cache aplikasi dibangun dari rollup lama
+        data_version.bump(cursor)
+        connection.commit()
+        return processed
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main():
+    from config.database import get_connection, release_connection
+
+    parser = argparse.ArgumentParser(description="Kelola tabel rollup term_frequency")
+    parser.add_argument('--rebuild', action='store_true', help="bangun ulang rollup dari sentiment_analysis")
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    if not args.rebuild:
+        parser.print_help()
+        return
+
+    connection = get_connection()
+    if connection is None:
+        raise SystemExit(1)
+    try:
+        processed = rebuild_term_frequencies(connection, batch_size=args.batch_size)
+        print(f"Term frequency rollup rebuilt from {processed} rows")
+    finally:
+        release_connection(connection)
+
+
+if __name__ == '__main__':
+    main()
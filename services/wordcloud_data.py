@@ -0,0 +1,44 @@
+from collections import Counter
+
+from services.metrics import timed
+
+
+def token_frequency_query(year, aspect_id):
+    """Query agregat rollup ``term_frequency`` beserta parameternya."""
+    query = """
+        SELECT sentimen, token, SUM(frekuensi) AS frekuensi
+        FROM term_frequency
+        WHERE tahun = %s
+    """
+    params = [int(year)]
+    if aspect_id != 'all':
+        query += " AND aspect_id = %s"
+        params.append(int(aspect_id))
+    query += " GROUP BY sentimen, token"
+    return query, params
+
+
+def fetch_token_frequencies(connection, year, aspect_id):
+    """Frekuensi token per sentimen untuk satu tahun dan aspek ('all' = semua).
+
+    Dibaca dari rollup ``term_frequency`` dengan satu query agregat.
+    Mengembalikan dict ``{sentimen: Counter}`` yang juga berisi
+    ``'keseluruhan'`` sebagai jumlah dari semua sentimen.
+    """
+    query, params = token_frequency_query(year, aspect_id)
+
+    frequencies = {}
+    overall = Counter()
+    cursor = connection.cursor()
+    try:
+        with timed('db_query'):
+            cursor.execute(query, params)
+            for sentimen, token, frekuensi in cursor:
+                frekuensi = int(frekuensi)
+                frequencies.setdefault(sentimen, Counter())[token] = frekuensi
+                overall[token] += frekuensi
+    finally:
+        cursor.close()
+
+    frequencies['keseluruhan'] = overall
+    return frequencies
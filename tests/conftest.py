@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Kamus normalisasi dimuat dengan path relatif terhadap root repo
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,22 @@
+import json
+
+import pandas as pd
+
+from services.bulk_load import prepare_rows
+
+
+def test_prepare_rows_rejects_blank_keluhan_and_unknown_sentimen():
+    chunk = pd.DataFrame({
+        'tanggal_keluhan': ['2024-01-01 08:00:00', '2024-01-02 08:00:00', '2024-01-03 08:00:00',
+                            '2024-01-04 08:00:00', None, '2024-01-06 08:00:00'],
+        'keluhan': ['Jalan rusak', None, '   ', 'Air mati', 'Lampu mati', 'Sampah menumpuk'],
+        'preprocessed_text': ['["jalan", "rusak"]', '[]', '[]', "['air', 'mati']", '[]', '[]'],
+        'sentimen': [' Negatif', 'netral', 'netral', None, 'netral', 'positif'],
+        'aspect_id': [1, 2, 2, 3, 4, None],
+    })
+
+    rows, rejected = prepare_rows(chunk)
+
+    assert rows == [('negatif', '2024-01-01 08:00:00', 'Jalan rusak', '["jalan", "rusak"]', 1)]
+    assert rejected == 5
+    assert json.loads(rows[0][3]) == ['jalan', 'rusak']
@@ -0,0 +1,66 @@
+import mysql.connector
+from mysql.connector import errorcode
+
+from services.dedup import content_hash, insert_new_rows, normalize_keluhan
+
+# Hasil SELECT pemeriksaan di migrations/002_content_hash.sql
+SQL_CHECK_HASH = 'c2a95b2b5a53cff0df51f6edc63a8f60e522b60a263fa15f163a38f890c44aa3'
+
+
+def test_content_hash_matches_migration_check():
+    keluhan = '\t Jalan Rusak \n  '
+    assert normalize_keluhan(keluhan) == '\t jalan rusak \n'
+    assert content_hash('2024-01-02 03:04:05', keluhan) == SQL_CHECK_HASH
+
+
+class FakeCursor:
+    """Cursor tiruan dengan unique index content_hash di memori.
+
+    ``concurrent`` berisi hash yang dimasukkan penyimpanan lain setelah
+    pengecekan ``existing_hashes``.
+    """
+
+    def __init__(self, existing=(), concurrent=()):
+        self.hashes = set(existing)
+        self.concurrent = set(concurrent)
+        self.rowcount = 0
+        self._result = []
+
+    def execute(self, query, params=()):
+        if query.lstrip().startswith('SELECT'):
+            self._result = [(value,) for value in params if value in self.hashes]
+            self.hashes |= self.concurrent
+            return
+        row_hash = params[-1]
+        self.rowcount = 0 if row_hash in self.hashes else 1
+        self.hashes.add(row_hash)
+
+    def executemany(self, query, rows):
+        if 'IGNORE' not in query and any(row[-1] in self.hashes for row in rows):
+            raise mysql.connector.IntegrityError(errno=errorcode.ER_DUP_ENTRY)
+        self.hashes.update(row[-1] for row in rows)
+        self.rowcount = len(rows)
+
+    def fetchall(self):
+        return self._result
+
+
+ROWS = [
+    ('negatif', '2024-01-0%d 08:00:00' % day, 'jalan rusak', '["jalan", "rusak"]', 1)
+    for day in range(1, 6)
+]
+
+
+def test_insert_new_rows_skips_existing_and_batch_duplicates():
+    cursor = FakeCursor(existing={content_hash(ROWS[0][1], ROWS[0][2])})
+    new_rows, skipped = insert_new_rows(cursor, ROWS + ROWS[1:2])
+    assert new_rows == ROWS[1:]
+    assert skipped == 2
+
+
+def test_insert_new_rows_excludes_rows_saved_concurrently():
+    concurrent = {content_hash(row[1], row[2]) for row in ROWS[1:3]}
+    cursor = FakeCursor(concurrent=concurrent)
+    new_rows, skipped = insert_new_rows(cursor, ROWS)
+    assert new_rows == [ROWS[0]] + ROWS[3:]
+    assert skipped == 2
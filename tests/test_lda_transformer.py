@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from gensim.corpora import Dictionary
+from gensim.models import LdaModel
+
+from models.LDATransformer import LDATransformer
+
+DOCS = [
+    ['jalan', 'rusak', 'aspal', 'lubang'],
+    ['air', 'pdam', 'mati', 'keruh'],
+    ['lampu', 'jalan', 'mati', 'gelap'],
+    ['sampah', 'menumpuk', 'bau', 'selokan'],
+    ['air', 'selokan', 'banjir', 'jalan'],
+    ['pelayanan', 'lambat', 'kelurahan', 'antri'],
+] * 5
+
+# None, dokumen satu kata dan dokumen tanpa kata yang dikenal kamus ikut diuji
+INPUT = [DOCS[0], None, DOCS[1], ['jalan'], ['tidakada'], DOCS[5]]
+
+NUM_TOPICS = 4
+
+
+def _transformers(alpha):
+    dictionary = Dictionary(DOCS)
+    corpus = [dictionary.doc2bow(doc) for doc in DOCS]
+    lda = LdaModel(corpus, id2word=dictionary, num_topics=NUM_TOPICS, random_state=1, passes=10,
+                   alpha=alpha, iterations=500, gamma_threshold=1e-6)
+    return LDATransformer(lda, dictionary), LDATransformer(lda, dictionary, batch_inference=False)
+
+
+@pytest.fixture(scope='module')
+def transformers():
+    return _transformers('symmetric')
+
+
+def test_batch_matches_per_document(transformers):
+    batch, per_document = transformers
+    expected = per_document.transform(INPUT)
+    actual = batch.transform(INPUT)
+    assert actual.shape == (len(INPUT), NUM_TOPICS)
+    assert np.allclose(actual, expected, atol=1e-5)
+
+
+def test_small_probabilities_zeroed_like_get_document_topics():
+    # alpha sangat kecil membuat topik yang tidak relevan < 1e-8
+    batch, per_document = _transformers(np.full(NUM_TOPICS, 1e-9))
+    expected = per_document.transform(INPUT)
+    actual = batch.transform(INPUT)
+    assert np.count_nonzero(expected[0] == 0) > 0
+    assert np.array_equal(actual == 0, expected == 0)
+    assert np.allclose(actual, expected, atol=1e-5)
+
+
+def test_none_rows_are_zero(transformers):
+    batch, per_document = transformers
+    for transformer in (batch, per_document):
+        assert not transformer.transform(INPUT)[1].any()
+        assert np.array_equal(transformer.transform([None, None]), np.zeros((2, NUM_TOPICS)))
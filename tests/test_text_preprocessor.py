@@ -0,0 +1,66 @@
+import copy
+import pickle
+
+import pytest
+
+from models.TextPreprocessor import TextPreprocessor, normalization_dict
+
+# Korpus acuan: tautan, tag <a>, emoji, huruf berulang dan kata tidak baku
+REFERENCE_CORPUS = [
+    'Jalan di depan rumah RUSAK PARAH, mohon segera diperbaiki!!!',
+    'Lihat https://lapor.example.go.id/123?x=1 untuk detail laporannya',
+    'Sudah lapor <a href="https://lapor.example.go.id/45" target="_blank">di sini</a> tapi belum ada tindak lanjut',
+    'Pelayanan kelurahan lamaaaa sekaliii 😡😡 tolong diperbaiki 🙏',
+    'krna pdam mati trs, udh 2 minggu gk ada air, sudab lapor jg blm ada kabar',
+    'Lampu penerangan jalan<br>mati total didlm gang 3 rt 05 rw 02',
+    'jelasssss wkwkwkw hadehhh skalian aja ajaa dicek pak',
+    '   spasi   berlebih\tdan\nbaris baru   ',
+    'Kode antrian A12 dan nomor 0812xxxx tidak jelas prosesnya??',
+    'The service is very slow and the staff are not helpful',
+    '',
+    None,
+]
+
+
+@pytest.fixture(scope='module', params=[True, False], ids=['stem', 'nostem'])
+def preprocessors(request):
+    fused = TextPreprocessor(do_stemming=request.param)
+    legacy = TextPreprocessor(do_stemming=request.param, fused=False)
+    return fused, legacy
+
+
+def test_corpus_hits_normalization_dictionary():
+    words = ' '.join(text.lower() for text in REFERENCE_CORPUS if text).split()
+    assert any(word.strip(',!?') in normalization_dict for word in words)
+
+
+def test_fused_matches_legacy_tokens(preprocessors):
+    fused, legacy = preprocessors
+    assert fused.transform(REFERENCE_CORPUS) == legacy.transform(REFERENCE_CORPUS)
+
+
+def test_fused_matches_legacy_pairs(preprocessors):
+    fused, legacy = preprocessors
+    assert fused.preprocess_pairs(REFERENCE_CORPUS) == legacy.preprocess_pairs(REFERENCE_CORPUS)
+
+
+def test_pickle_does_not_modify_original():
+    preprocessor = TextPreprocessor()
+    expected = preprocessor.transform(REFERENCE_CORPUS)
+
+    restored = pickle.loads(pickle.dumps(preprocessor))
+    copy.copy(preprocessor)
+
+    assert preprocessor.transform(REFERENCE_CORPUS) == expected
+    assert restored.transform(REFERENCE_CORPUS) == expected
+
+
+def test_parallel_stemming_fills_parent_cache():
+    serial = TextPreprocessor()
+    parallel = TextPreprocessor(n_jobs=2, chunk_size=4)
+    corpus = [text for text in REFERENCE_CORPUS if text] * 2
+
+    assert parallel.transform(corpus) == serial.transform(corpus)
+    assert dict(parallel._stem_cache) == dict(serial._stem_cache)
+    info = parallel.stem_cache_info()
+    assert info['hits'] + info['misses'] == serial.stem_cache_hits + serial.stem_cache_misses